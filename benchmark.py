@@ -1,27 +1,205 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from pyquerystring import parse
+"""
+Benchmarks pyquerystring against urllib's parse_qsl over a fixed set of
+corpora.
+
+    python benchmark.py                       # print results
+    python benchmark.py --save baseline.json  # record a baseline
+    python benchmark.py --compare baseline.json --threshold 10
 
-from collections import Counter
-from pprint import pprint
+With --compare the exit status is 1 when any corpus is more than
+--threshold percent slower than the baseline.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
 import timeit
-from urlparse import parse_qsl
+import tracemalloc
+from urllib.parse import parse_qsl
 
+from pyquerystring import parse
+from pyquerystring import KeyPathCache
 
-def bench_urlparse():
-    parse_qsl("id=1")
 
-def bench():
-    parse("id=1")
+class QueryDict(object):
+    """
+    Stand-in for django.http.QueryDict: a multi-valued mapping exposing
+    its values through lists().
+    """
+
+    def __init__(self, pairs):
+        self._lists = {}
+        for key, value in pairs:
+            self._lists.setdefault(key, []).append(value)
+
+    def lists(self):
+        return self._lists.items()
+
+
+def flat(rng):
+    pairs = [('param%d' % i, 'value%d' % rng.randint(0, 999))
+             for i in range(20)]
+    return '&'.join('%s=%s' % p for p in pairs), len(pairs)
+
+
+def deep(rng):
+    pairs = []
+    for i in range(10):
+        pairs.append(('a.b.c.d[%d].e[f].g' % i, 'x%d' % i))
+        pairs.append(('filter[%d][range][min]' % i, str(rng.randint(0, 99))))
+    return '&'.join('%s=%s' % p for p in pairs), len(pairs)
+
+
+def pushes(rng):
+    pairs = [('ids[]', str(rng.randint(0, 99999))) for _ in range(200)]
+    return '&'.join('%s=%s' % p for p in pairs), len(pairs)
+
+
+def sparse(rng):
+    indices = rng.sample(range(5000), 50)
+    pairs = [('rows[%d].col' % i, 'v%d' % i) for i in indices]
+    return '&'.join('%s=%s' % p for p in pairs), len(pairs)
+
+
+def form_body(rng):
+    pairs = []
+    for row in range(500):
+        for col in ('sku', 'qty', 'note'):
+            value = 'caf%C3%A9+' + str(rng.randint(0, 9999))
+            pairs.append(('rows[%d].%s' % (row, col), value))
+    body = '&'.join('%s=%s' % p for p in pairs)
+    return body.encode('ascii'), len(pairs)
+
+
+def multidict(rng):
+    pairs = [('tag', 't%d' % i) for i in range(10)]
+    pairs += [('dog[%d].name' % i, 'n%d' % i) for i in range(10)]
+    return QueryDict(pairs), len(pairs)
+
+
+CORPORA = (
+    ('flat', flat),
+    ('deep', deep),
+    ('pushes', pushes),
+    ('sparse', sparse),
+    ('form_body', form_body),
+    ('multidict', multidict),
+)
 
-if __name__ == '__main__':
 
-    c = Counter()
+def measure(func, number, repeat):
+    timer = timeit.Timer(func)
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number
 
-    t = timeit.Timer(stmt='bench_urlparse()', setup='from __main__ import bench_urlparse')
-    c['parse_qsl simple'] = t.timeit(number=1000) * 100
 
-    t = timeit.Timer(stmt='bench()', setup='from __main__ import bench')
-    c['pyquerystring simple'] = t.timeit(number=1000) * 100
+def peak_allocation(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
 
-    pprint(c)
+
+def run(number, repeat, seed):
+    results = {}
+    for name, factory in CORPORA:
+        data, count = factory(random.Random(seed))
+        cache = KeyPathCache()
+
+        def bench():
+            parse(data, key_cache=cache)
+
+        if isinstance(data, bytes):
+            def baseline():
+                parse_qsl(data.decode('ascii'))
+        elif isinstance(data, str):
+            def baseline():
+                parse_qsl(data)
+        else:
+            baseline = None
+
+        seconds = measure(bench, number, repeat)
+        entry = {
+            'pairs': count,
+            'ops_per_sec': 1.0 / seconds,
+            'us_per_pair': seconds * 1e6 / count,
+            'peak_bytes': peak_allocation(bench),
+        }
+        if baseline is not None:
+            base_seconds = measure(baseline, number, repeat)
+            entry['parse_qsl_ops_per_sec'] = 1.0 / base_seconds
+            entry['vs_parse_qsl'] = seconds / base_seconds
+            entry['parse_qsl_peak_bytes'] = peak_allocation(baseline)
+        results[name] = entry
+    return results
+
+
+def report(results, previous=None):
+    header = '%-10s %7s %12s %10s %12s %10s' % (
+        'corpus', 'pairs', 'ops/sec', 'us/pair', 'peak bytes', 'x qsl')
+    if previous:
+        header += ' %9s' % 'change'
+    print(header)
+
+    for name, _ in CORPORA:
+        entry = results[name]
+        line = '%-10s %7d %12.1f %10.3f %12d %10s' % (
+            name, entry['pairs'], entry['ops_per_sec'], entry['us_per_pair'],
+            entry['peak_bytes'],
+            '%.2f' % entry['vs_parse_qsl'] if 'vs_parse_qsl' in entry else '-')
+        if previous and name in previous:
+            line += ' %+8.1f%%' % change(previous[name], entry)
+        print(line)
+
+
+def change(before, after):
+    # positive means slower than before
+    return (before['ops_per_sec'] / after['ops_per_sec'] - 1.0) * 100
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--save', metavar='PATH')
+    parser.add_argument('--compare', metavar='PATH')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='allowed slowdown in percent (default 10)')
+    args = parser.parse_args(argv)
+
+    results = run(args.number, args.repeat, args.seed)
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)['results']
+
+    report(results, previous)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'number': args.number,
+                'repeat': args.repeat,
+                'seed': args.seed,
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+    if previous:
+        slower = [name for name in results if name in previous and
+                  change(previous[name], results[name]) > args.threshold]
+        if slower:
+            print('Regressions: %s' % ', '.join(slower))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
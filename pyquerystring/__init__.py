@@ -21,4 +21,28 @@ __license__ = 'Apache 2'
 __copyright__ = 'Copyright 2011-2016 Adam Venturella'
 
 from .querystring import parse
+from .querystring import parse_stream
 from .querystring import QueryStringParser
+from .querystring import QueryStringLimitError
+from .querystring import Limits
+from .cache import KeyPathCache
+from .batch import parse_many
+from .schema import Schema
+from .schema import Field
+from .schema import QueryStringSchemaError
+from .encoder import stringify
+from .encoder import QueryStringEncoder
+from .adapters import register_adapter
+from .compact import CompactObject
+from .compact import CompactArray
+from .compact import to_python
+from .stats import ParseStats
+from .jsonout import parse_json
+from .memo import ResultCache
+from .columnar import parse_columns
+from .interning import InternTable
+from .logscan import scan_log
+from .logscan import count_log
+from .aio import parse_async
+from .aio import asgi_body
+from .aio import QueryStringDisconnectError
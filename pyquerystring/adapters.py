@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Adapters turn the containers a QueryStringParser is given into an iterable
+of (key, value) pairs, one pair per value.
+
+Framework containers are registered by dotted class name so the frameworks
+never need to be imported here. Own containers can be registered by class
+or by name:
+
+>>> register_adapter(MyRequestArgs, lambda data: data.iter_pairs())
+"""
+import threading
+
+
+def pairs_from_sequence(data):
+    # a list or tuple of the type generated by parse_qsl
+    return data
+
+
+def pairs_from_lists(data):
+    # django.http.QueryDict: lists() yields (key, [values])
+    for key, values in data.lists():
+        for value in values:
+            yield key, value
+
+
+def pairs_from_multi_items(data):
+    # werkzeug.datastructures.MultiDict: a plain items() would only return
+    # the first value of each key
+    return data.items(multi=True)
+
+
+def pairs_from_items(data):
+    # webob.multidict.MultiDict and plain mappings
+    return data.items()
+
+
+_adapters = {
+    list: pairs_from_sequence,
+    tuple: pairs_from_sequence,
+}
+
+_named_adapters = {
+    'django.http.request.QueryDict': pairs_from_lists,
+    'werkzeug.datastructures.MultiDict': pairs_from_multi_items,
+    'werkzeug.datastructures.structures.MultiDict': pairs_from_multi_items,
+    'webob.multidict.MultiDict': pairs_from_items,
+    'webob.multidict.NestedMultiDict': pairs_from_items,
+    'webob.multidict.GetDict': pairs_from_items,
+}
+
+# concrete type -> adapter, filled in as types are first seen
+_resolved = {}
+_lock = threading.Lock()
+
+
+def register_adapter(cls, adapter):
+    """
+    Use adapter(data) to read pairs from instances of cls and its
+    subclasses. cls is a class or a dotted `module.ClassName` string.
+    """
+    with _lock:
+        if isinstance(cls, str):
+            _named_adapters[cls] = adapter
+        else:
+            _adapters[cls] = adapter
+        _resolved.clear()
+
+
+def get_adapter(data):
+    cls = type(data)
+    adapter = _resolved.get(cls)
+    if adapter is None:
+        adapter = _resolve(cls)
+        with _lock:
+            _resolved[cls] = adapter
+    return adapter
+
+
+def _resolve(cls):
+    for base in getattr(cls, '__mro__', (cls,)):
+        adapter = _adapters.get(base)
+        if adapter is not None:
+            return adapter
+
+        adapter = _named_adapters.get('%s.%s' % (base.__module__,
+                                                 base.__name__))
+        if adapter is not None:
+            return adapter
+
+    # unregistered multidicts, duck typed as before
+    if hasattr(cls, 'lists'):
+        return pairs_from_lists
+    return pairs_from_items
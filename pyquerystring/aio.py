@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+from .compat import get_running_loop
+from .querystring import QueryStringParser
+
+
+class QueryStringDisconnectError(Exception):
+    """
+    Raised when the client disconnects before the whole body has arrived,
+    so a truncated body is never parsed as if it were complete.
+    """
+
+
+async def asgi_body(receive):
+    """
+    Async iterator over the body chunks of an ASGI `http.request` stream.
+
+    >>> result = await parse_async(asgi_body(receive))
+
+    Raises QueryStringDisconnectError on `http.disconnect`.
+    """
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise QueryStringDisconnectError(
+                'Client disconnected before the request body was complete')
+
+        body = message.get('body')
+        if body:
+            yield body
+        if not message.get('more_body', False):
+            return
+
+
+async def parse_async(source, offload_threshold=None, executor=None,
+                      **kwargs):
+    """
+    Parse an urlencoded body from an async iterable of bytes chunks, giving
+    control back to the event loop after every chunk. Other keyword
+    arguments are passed to QueryStringParser.
+
+    Once more than offload_threshold bytes have arrived, the remaining
+    chunks, and building the final result, are handed to executor (the
+    loop's default executor when None) so a very large body does not hold
+    up the loop. The result is the same as `parse` on the whole body.
+    """
+    loop = get_running_loop()
+    obj = QueryStringParser(**kwargs)
+    received = 0
+    offload = False
+
+    async for chunk in source:
+        received += len(chunk)
+        if not offload and offload_threshold is not None:
+            offload = received > offload_threshold
+
+        if offload:
+            await loop.run_in_executor(executor, obj.feed, chunk)
+        else:
+            obj.feed(chunk)
+            await asyncio.sleep(0)
+
+    if offload:
+        return await loop.run_in_executor(executor, obj.close)
+    return obj.close()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import multiprocessing
+from collections import deque
+from itertools import islice
+
+from .querystring import QueryStringParser
+
+
+def parse_many(iterable, workers=None, chunksize=256, **kwargs):
+    """
+    Lazily parse every querystring in iterable, yielding results in input
+    order. Any other keyword arguments are passed to QueryStringParser.
+
+    >>> for result in parse_many(open('access.qs', 'rb'), workers=4):
+    ...     pass
+
+    Serially, all items share one key cache, so each key shape in the batch
+    is only tokenized once. With workers, items are sent to a process pool
+    chunksize at a time and each worker keeps its own default key cache;
+    at most two chunks per worker are in flight, so arbitrarily large
+    inputs are streamed rather than read up front.
+    """
+    if not workers:
+        return _parse_serial(iterable, kwargs)
+
+    if 'key_cache' in kwargs:
+        raise ValueError('key_cache cannot be shared with worker processes')
+
+    return _parse_parallel(iterable, workers, chunksize, kwargs)
+
+
+def _parse_serial(iterable, kwargs):
+    for data in iterable:
+        yield QueryStringParser(data, **kwargs).result
+
+
+def _parse_chunk(chunk, kwargs):
+    return [QueryStringParser(data, **kwargs).result for data in chunk]
+
+
+def _chunks(iterable, chunksize):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parse_parallel(iterable, workers, chunksize, kwargs):
+    pool = multiprocessing.Pool(workers)
+    try:
+        chunks = _chunks(iterable, chunksize)
+        pending = deque(
+            pool.apply_async(_parse_chunk, (chunk, kwargs))
+            for chunk in islice(chunks, workers * 2))
+
+        while pending:
+            results = pending.popleft().get()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.apply_async(_parse_chunk, (chunk, kwargs)))
+            for result in results:
+                yield result
+
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+
+
+class KeyPathCache(object):
+    """
+    Bounded, least-recently-used mapping of raw query string keys to their
+    compiled token tuples.
+
+    A single instance is shared by every QueryStringParser unless one is
+    passed explicitly, so a key shape like `filter[status]` is tokenized once
+    per process rather than once per request.
+
+    >>> cache = KeyPathCache(maxsize=2)
+    >>> cache.set('a', ('A',))
+    >>> cache.get('a')
+    ('A',)
+    >>> cache.hits, cache.misses
+    (1, 0)
+
+    A maxsize of 0 disables caching entirely. Keys longer than
+    max_key_length are never stored, so a client sending huge keys cannot
+    pin them in the shared cache beyond its request; None allows any
+    length.
+    """
+
+    def __init__(self, maxsize=1024, max_key_length=256):
+        self.maxsize = maxsize
+        self.max_key_length = max_key_length
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+
+            # re-inserting moves the key to the most recently used end
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        if self.max_key_length is not None and len(key) > self.max_key_length:
+            return
+
+        with self._lock:
+            data = self._data
+            data.pop(key, None)
+            data[key] = value
+            while len(data) > self.maxsize:
+                data.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'max_key_length': self.max_key_length,
+        }
+
+
+#: Cache shared by all parsers that are not given one explicitly.
+default_key_cache = KeyPathCache()
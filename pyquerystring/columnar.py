@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar parsing of many querystrings at once, for aggregating over a large
+batch without building a result tree per querystring.
+
+Every key path becomes one column, named by its flattened path with array
+indices collapsed to `[]`:
+
+    utm.source=a&items[0].sku=x&items[1].sku=y
+    -> {'utm.source': ['a'], 'items[].sku': [['x', 'y']]}
+"""
+from array import array
+
+from .querystring import QueryStringParser
+from .querystring import QueryStringToken
+from .querystring import is_flat_key
+
+#: How many distinct keys a call remembers the column of.
+PATH_CACHE_SIZE = 4096
+
+_FLOAT_TYPECODES = ('f', 'd')
+
+
+class Columns(dict):
+    """
+    Mapping of column name to column, one entry per row in each, with the
+    number of rows parsed in `rows`.
+    """
+
+    def __init__(self):
+        dict.__init__(self)
+        self.rows = 0
+
+
+def parse_columns(iterable, types=None, missing=None, **kwargs):
+    """
+    Parse every querystring in iterable into a Columns mapping of flattened
+    key path to a list with one value per querystring.
+
+    >>> columns = parse_columns(open('tracking.qs', 'rb'),
+    ...                         types={'page': 'l'})
+    >>> columns['utm.source'], columns['page']
+    (['mail', None], array('l', [2, 0]))
+
+    Rows without a column hold `missing`. A column whose path crosses an
+    array holds, per row, the list of values present in index order with
+    pushes after explicit indices; otherwise the last value for a path
+    wins. Paths are independent, so `a=1&a.b=2` yields both `a` and `a.b`.
+
+    types maps column names to `array` typecodes; those columns are
+    returned as an `array`, which exposes its buffer to NumPy without a
+    copy. Missing and unconvertible values are stored as `missing`, or as
+    NaN for float typecodes and 0 otherwise when `missing` is None. Array
+    valued columns cannot be typed.
+
+    Other keyword arguments are passed to QueryStringParser, whose reader,
+    filters, limits and key cache are used for every querystring.
+    """
+    parser = QueryStringParser(**kwargs)
+    types = types or {}
+    limits = parser.limits
+    paths = {}
+    columns = Columns()
+    rows = 0
+
+    for data in iterable:
+        parser._pair_count = 0
+        cells = {}
+        pushes = 0
+
+        for key, value in parser.pairs(data):
+            if limits is not None:
+                parser._pair_count += 1
+                limits.check_pair(parser._pair_count, key, value)
+
+            path = paths.get(key)
+            if path is None:
+                if len(paths) >= PATH_CACHE_SIZE:
+                    paths.clear()
+                path = paths[key] = _column_path(parser, key)
+
+            name, indices = path
+            if name is None:
+                continue
+            if not indices:
+                cells[name] = value
+                continue
+
+            position = []
+            for index in indices:
+                if index is None:
+                    pushes += 1
+                    position.append((1, pushes))
+                else:
+                    position.append((0, index))
+
+            cell = cells.get(name)
+            if type(cell) is not dict:
+                cell = cells[name] = {}
+            cell[tuple(position)] = value
+
+        for name, cell in cells.items():
+            if type(cell) is dict:
+                cell = [cell[position] for position in sorted(cell)]
+            _append(columns, name, cell, rows, types, missing)
+        rows += 1
+
+    for name, column in columns.items():
+        _pad(column, rows, _fill(types.get(name), missing))
+
+    columns.rows = rows
+    return columns
+
+
+def _column_path(parser, key):
+    """
+    Returns the column name of a key and the indices it holds, one per
+    array crossed (None for a push). The name is None for keys parse()
+    assigns no value to, such as `` or `a.`.
+    """
+    if is_flat_key(key):
+        return key, ()
+
+    try:
+        path = parser.compile(key)
+    except ValueError:
+        return key, ()
+
+    if not path or path[-1][0] != QueryStringToken.KEY:
+        # nothing is assigned, at most an empty container is created
+        return None, ()
+
+    if parser.limits is not None:
+        parser.limits.check_path(path)
+
+    name = ''
+    indices = []
+    in_array = False
+    for token_type, token in path:
+        if token_type == QueryStringToken.KEY and in_array:
+            name += '[]'
+            indices.append(token)
+            in_array = False
+            continue
+
+        in_array = token_type == QueryStringToken.ARRAY
+        if token != '':
+            name = '%s.%s' % (name, token) if name else str(token)
+
+    return name, tuple(indices)
+
+
+def _fill(typecode, missing):
+    if typecode is None or missing is not None:
+        return missing
+    return float('nan') if typecode in _FLOAT_TYPECODES else 0
+
+
+def _pad(column, length, fill):
+    if len(column) < length:
+        column.extend([fill] * (length - len(column)))
+
+
+def _append(columns, name, value, row, types, missing):
+    typecode = types.get(name)
+    fill = _fill(typecode, missing)
+
+    column = columns.get(name)
+    if column is None:
+        column = columns[name] = [] if typecode is None else array(typecode)
+    _pad(column, row, fill)
+
+    if typecode is None:
+        column.append(value)
+        return
+
+    if isinstance(value, list):
+        raise ValueError('Column %r holds arrays and cannot be typed' % name)
+
+    convert = float if typecode in _FLOAT_TYPECODES else int
+    try:
+        column.append(convert(value))
+    except (TypeError, ValueError, OverflowError):
+        column.append(fill)
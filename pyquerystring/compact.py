@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Immutable, memory-lean stand-ins for the dicts and lists of a parse result,
+returned by `parse(data, compact=True)`.
+
+A CompactObject holds a tuple of values and a shape, the name to position
+mapping shared by every object with the same keys in the same order, so a
+thousand `rows[i].col` objects store their key once rather than a thousand
+dicts. A CompactArray stores its items in a tuple; an array that is mostly
+holes instead keeps its indices in an `array` and no padding at all.
+"""
+import sys
+from array import array
+from bisect import bisect_left
+
+from .compat import Mapping
+from .compat import Sequence
+from .cache import KeyPathCache
+
+#: Shapes shared by every compact result in the process, keyed by tuples of
+#: names, so max_key_length would bound the number of keys in an object.
+shapes = KeyPathCache(maxsize=4096, max_key_length=None)
+
+
+class CompactObject(Mapping):
+
+    __slots__ = ('_shape', '_values')
+
+    def __init__(self, shape, values):
+        self._shape = shape
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._shape[key]]
+
+    def __iter__(self):
+        return iter(self._shape)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return 'CompactObject(%r)' % (dict(self.items()),)
+
+
+class CompactArray(Sequence):
+
+    __slots__ = ('_indices', '_values', '_length')
+
+    def __init__(self, values, indices=None, length=None):
+        self._values = values
+        self._indices = indices
+        self._length = len(values) if length is None else length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('CompactArray index out of range')
+
+        indices = self._indices
+        if indices is None:
+            return self._values[index]
+
+        position = bisect_left(indices, index)
+        if position < len(indices) and indices[position] == index:
+            return self._values[position]
+        return None
+
+    def __len__(self):
+        return self._length
+
+    def __eq__(self, other):
+        if isinstance(other, (CompactArray, list, tuple)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'CompactArray(%r)' % (list(self),)
+
+
+def _shape(keys):
+    shape = shapes.get(keys)
+    if shape is None:
+        shape = dict((key, index) for index, key in enumerate(keys))
+        shapes.set(keys, shape)
+    return shape
+
+
+def _compact_array(items):
+    present = [i for i, item in enumerate(items) if item is not None]
+    return _positioned_array([items[i] for i in present], present, len(items))
+
+
+def _positioned_array(values, positions, length):
+    # values[i] is the item at positions[i]; positions are ascending
+    if length - len(values) <= len(values):
+        if len(values) == length:
+            return CompactArray(tuple(values))
+        items = [None] * length
+        for position, value in zip(positions, values):
+            items[position] = value
+        return CompactArray(tuple(items))
+
+    # mostly holes: keep only the indices that hold something
+    return CompactArray(tuple(values), array('l', positions), length)
+
+
+def compact(root, stats=None):
+    """
+    Convert a result into CompactObject and CompactArray nodes.
+
+    root is either a materialized result of dicts and lists or a parser's
+    working tree, whose sparse arrays are compacted from their entries
+    without ever being padded out, so `a[3000000]=x` holds one value.
+    stats, a ParseStats, records each sparse array.
+    """
+    from .querystring import SparseArray
+
+    # post-order without recursion: a frame is (node, children, converted,
+    # positions), positions being the indices of a sparse array's entries
+    frame = _frame(root, SparseArray, stats)
+    stack = [frame]
+    while True:
+        node, children, converted, positions = stack[-1]
+        for child in children:
+            if isinstance(child, (dict, list, SparseArray)):
+                stack.append(_frame(child, SparseArray, stats))
+                break
+            converted.append(child)
+        else:
+            stack.pop()
+            if isinstance(node, dict):
+                value = CompactObject(_shape(tuple(node)), tuple(converted))
+            elif positions is not None:
+                length = positions[-1] + 1 if positions else 0
+                value = _positioned_array(converted, positions, length)
+            else:
+                value = _compact_array(converted)
+
+            if not stack:
+                return value
+            stack[-1][2].append(value)
+
+
+def _frame(node, sparse_type, stats):
+    if isinstance(node, dict):
+        return node, iter(node.values()), [], None
+
+    if isinstance(node, sparse_type):
+        if stats is not None:
+            stats.record_array(node)
+        indexed = node.indexed
+        positions = sorted(indexed)
+        # pushes always follow the explicit indices
+        start = positions[-1] + 1 if positions else 0
+        positions.extend(range(start, start + len(node.pushed)))
+        children = [indexed[i] for i in positions[:len(indexed)]]
+        children.extend(node.pushed)
+        return node, iter(children), [], positions
+
+    return node, iter(node), [], None
+
+
+def to_python(obj):
+    """
+    Convert a compact result back into plain dicts and lists.
+    """
+    if isinstance(obj, CompactObject):
+        root = dict(obj.items())
+    elif isinstance(obj, CompactArray):
+        root = list(obj)
+    else:
+        return obj
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            keys = list(node.keys())
+        else:
+            keys = range(len(node))
+        for key in keys:
+            child = node[key]
+            if isinstance(child, CompactObject):
+                child = node[key] = dict(child.items())
+                stack.append(child)
+            elif isinstance(child, CompactArray):
+                child = node[key] = list(child)
+                stack.append(child)
+    return root
+
+
+def sizeof(obj):
+    """
+    Estimate the memory held by a compact result: every node, its value
+    tuple and index array, and every value. Shapes are left out since they
+    are shared by all results with the same keys.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        size += sys.getsizeof(node)
+        if isinstance(node, CompactObject):
+            values = node._values
+        elif isinstance(node, CompactArray):
+            values = node._values
+            if node._indices is not None:
+                size += sys.getsizeof(node._indices)
+        else:
+            continue
+        size += sys.getsizeof(values)
+        stack.extend(value for value in values if value is not None)
+    return size
@@ -1,17 +1,16 @@
 # -*- coding: utf-8 -*-
-# from requests:
-# https://github.com/kennethreitz/requests/blob/master/requests/compat.py
+# Python 3.6 is the oldest version supported; everything that differs
+# between the versions still supported is imported from here.
 
-import sys
-_ver = sys.version_info
+from urllib.parse import parse_qsl
+from urllib.parse import unquote_plus
+from urllib.parse import unquote_to_bytes
+from urllib.parse import quote_plus
+from collections.abc import Mapping
+from collections.abc import Sequence
 
-#: Python 2.x?
-is_py2 = (_ver[0] == 2)
-
-#: Python 3.x?
-is_py3 = (_ver[0] == 3)
-
-if is_py2:
-    from urlparse import parse_qsl
-elif is_py3:
-    from urllib.parse import parse_qsl
+try:
+    from asyncio import get_running_loop
+except ImportError:
+    # Python 3.6, where inside a coroutine this is the running loop
+    from asyncio import get_event_loop as get_running_loop
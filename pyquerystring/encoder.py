@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+from .compat import Mapping
+from .compat import quote_plus
+from .cache import KeyPathCache
+
+
+def stringify(obj, **kwargs):
+    """
+    Encode a nested structure as a querystring that `parse` turns back
+    into the same structure. Keyword arguments are QueryStringEncoder
+    options.
+
+    >>> stringify({'dog': [{'name': 'lucy'}], 'id': 1})
+    'dog[0].name=lucy&id=1'
+    """
+    if kwargs:
+        return QueryStringEncoder(**kwargs).encode(obj)
+    return _default_encoder.encode(obj)
+
+
+def _check_root(obj):
+    if not isinstance(obj, Mapping):
+        raise TypeError('Only mappings can be encoded, not %s'
+                        % type(obj).__name__)
+
+
+def _check_name(prefix, name):
+    # parse strips keys and removes spaces from them before tokenizing,
+    # and brackets, or a `.` in a top level name, always split a key
+    if (not name or name != name.strip() or ' ' in name or
+            '[' in name or ']' in name or (not prefix and '.' in name)):
+        raise ValueError('The name %r cannot be encoded so that it parses '
+                         'back unchanged' % (name,))
+
+
+class QueryStringEncoder(object):
+    """
+    Encodes dicts, lists and scalars in the notation QueryStringParser
+    understands.
+
+    array_style `index` writes `dog[0]=lucy`; `brackets` writes `dog[]=lucy`
+    for lists of scalars without gaps, falling back to indices otherwise
+    since pushes cannot express holes or objects spread over several keys.
+
+    object_style `dot` writes `dog.name=lucy`; `brackets` writes
+    `dog[name]=lucy`. Names that would be misread in the chosen style, such
+    as `name.1` in dot notation, use the other one. Names no style can
+    express raise ValueError: empty names, names containing brackets or
+    spaces or starting or ending with whitespace, and top level names
+    containing `.`.
+
+    None values are omitted, as are empty strings, which parse drops.
+    Encoded key prefixes are cached, so repeated shapes are only built once.
+    """
+
+    ARRAY_STYLES = ('index', 'brackets')
+    OBJECT_STYLES = ('dot', 'brackets')
+
+    def __init__(self, array_style='index', object_style='dot',
+                 charset='utf-8', prefix_cache_size=1024):
+        if array_style not in self.ARRAY_STYLES:
+            raise ValueError('Unknown array_style: %r' % (array_style,))
+        if object_style not in self.OBJECT_STYLES:
+            raise ValueError('Unknown object_style: %r' % (object_style,))
+
+        self.array_style = array_style
+        self.object_style = object_style
+        self.charset = charset
+        self.prefixes = KeyPathCache(prefix_cache_size)
+
+    def encode(self, obj):
+        _check_root(obj)
+        parts = []
+        self._encode('', obj, parts.append)
+        return '&'.join(parts)
+
+    def write(self, obj, stream):
+        """
+        Write the encoding of obj to stream, pair by pair, without building
+        the whole string first.
+        """
+        _check_root(obj)
+        write = stream.write
+        separator = ['']
+
+        def emit(part):
+            write(separator[0])
+            write(part)
+            separator[0] = '&'
+
+        self._encode('', obj, emit)
+
+    def _encode(self, prefix, obj, emit):
+        if isinstance(obj, Mapping):
+            for name, value in obj.items():
+                self._encode(self._member(prefix, name), value, emit)
+
+        elif isinstance(obj, (list, tuple)):
+            push = self.array_style == 'brackets' and not any(
+                value is None or isinstance(value, (Mapping, list, tuple))
+                for value in obj)
+
+            for index, value in enumerate(obj):
+                if value is not None:
+                    key = self._index(prefix, None if push else index)
+                    self._encode(key, value, emit)
+
+        elif obj is not None:
+            value = self._quote(obj)
+            if value:
+                emit(prefix + '=' + value)
+
+    def _quote(self, value):
+        if value is True or value is False:
+            return 'true' if value else 'false'
+        if not isinstance(value, bytes):
+            value = str(value).encode(self.charset)
+        return quote_plus(value)
+
+    def _member(self, prefix, name):
+        # names are text and indices ints, so the two never share an entry
+        name = str(name)
+        cache_key = (prefix, name)
+        key = self.prefixes.get(cache_key)
+        if key is not None:
+            return key
+
+        _check_name(prefix, name)
+        segment = self._quote(name)
+        if not prefix:
+            key = segment
+        elif name.isdigit() or (self.object_style == 'dot' and
+                                '.' not in name):
+            key = prefix + '.' + segment
+        else:
+            key = prefix + '[' + segment + ']'
+
+        self.prefixes.set(cache_key, key)
+        return key
+
+    def _index(self, prefix, index):
+        if index is None:
+            return prefix + '[]'
+
+        cache_key = (prefix, index)
+        key = self.prefixes.get(cache_key)
+        if key is None:
+            key = '%s[%d]' % (prefix, index)
+            self.prefixes.set(cache_key, key)
+        return key
+
+
+_default_encoder = QueryStringEncoder()
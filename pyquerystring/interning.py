@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+
+from .querystring import is_flat_key
+
+
+class InternTable(object):
+    """
+    Bounded, least-recently-used table of shared strings, so results parsed
+    with the same table hold one copy of each key and short value instead
+    of one per result.
+
+    >>> table = InternTable(maxsize=4096, max_length=16)
+    >>> first = parse('sort=asc&page=20', interning=table)
+    >>> second = parse('sort=asc&page=21', interning=table)
+    >>> first['sort'] is second['sort']
+    True
+
+    Single name keys, the names nested keys are tokenized into, and values
+    are interned when they are at most max_length characters long. Once
+    maxsize strings are held the least recently used one is evicted, so a
+    stream of one-off values, such as timestamps, cannot lock common
+    strings out of the table; results already holding an evicted string
+    keep their copy.
+    """
+
+    def __init__(self, maxsize=4096, max_length=32):
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, value):
+        return value in self._data
+
+    def intern(self, value):
+        """
+        Returns the shared copy of value, adding value to the table when it
+        is short enough.
+        """
+        if not isinstance(value, str) or len(value) > self.max_length:
+            return value
+        with self._lock:
+            return self._intern(value)
+
+    def pairs(self, pairs):
+        """
+        Interns the single name keys and short values of an iterable of
+        pairs as it is consumed. Other keys are left as they are; the
+        parser interns the names they are tokenized into instead.
+        """
+        max_length = self.max_length
+        lock = self._lock
+        intern = self._intern
+        for key, value in pairs:
+            if is_flat_key(key) and len(key) <= max_length:
+                with lock:
+                    key = intern(key)
+
+            if isinstance(value, str) and len(value) <= max_length:
+                with lock:
+                    value = intern(value)
+
+            yield key, value
+
+    def _intern(self, value):
+        # called with the lock held
+        data = self._data
+        shared = data.get(value)
+        if shared is not None:
+            data.move_to_end(value)
+            self.hits += 1
+            return shared
+
+        self.misses += 1
+        data[value] = value
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import json
+from json.encoder import encode_basestring_ascii
+
+from .querystring import QueryStringParser
+from .querystring import SparseArray
+
+_END = object()
+
+
+def parse_json(data, **kwargs):
+    """
+    Parse data straight to a JSON document, returned as bytes. The output
+    is identical to `json.dumps(parse(data)).encode('ascii')`.
+
+    Pairs are still gathered into the parser's working tree, since a later
+    pair may land anywhere in the document, but arrays are written from
+    their sparse entries and never laid out as lists, and no result is
+    materialized. Other keyword arguments are passed to QueryStringParser;
+    with stats, writing the document is timed as the build phase.
+    """
+    if kwargs.get('compact'):
+        raise TypeError('parse_json does not build a result to compact')
+
+    obj = QueryStringParser(**kwargs)
+    obj._consume(obj.pairs(data))
+
+    stats = obj.stats
+    if stats is not None:
+        started = stats.timer()
+
+    parts = []
+    _write(obj.result, parts.append, stats)
+    document = ''.join(parts).encode('ascii')
+
+    if stats is not None:
+        stats.finish(started)
+    return document
+
+
+def _string(value):
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    return json.dumps(value)
+
+
+def _array_values(sparse):
+    indexed = sparse.indexed
+    if indexed:
+        get = indexed.get
+        for index in range(max(indexed) + 1):
+            yield get(index)
+    for value in sparse.pushed:
+        yield value
+
+
+def _write(root, write, stats=None):
+    # Without recursion: each frame is [iterator, closing bracket, is an
+    # object, no entries written yet].
+    write('{')
+    stack = [[iter(root.items()), '}', True, True]]
+
+    while stack:
+        frame = stack[-1]
+        entry = next(frame[0], _END)
+        if entry is _END:
+            write(frame[1])
+            stack.pop()
+            continue
+
+        if frame[3]:
+            frame[3] = False
+        else:
+            write(', ')
+
+        if frame[2]:
+            key, value = entry
+            write(_string(key if isinstance(key, str) else json.dumps(key)))
+            write(': ')
+        else:
+            value = entry
+
+        if type(value) is dict:
+            write('{')
+            stack.append([iter(value.items()), '}', True, True])
+        elif type(value) is SparseArray:
+            if stats is not None:
+                stats.record_array(value)
+            write('[')
+            stack.append([_array_values(value), ']', False, True])
+        elif value is None:
+            write('null')
+        else:
+            write(_string(value))
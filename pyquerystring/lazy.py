@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import re
+
+from .compat import Mapping
+from .querystring import QueryStringParser
+
+# the first character that ends a top level key
+_TOP_LEVEL_END = re.compile(r'[\[.]')
+
+
+class LazyResult(Mapping):
+    """
+    Read-only mapping returned by `parse(data, lazy=True)`.
+
+    Up front, pairs are only decoded and grouped by their top level key.
+    Each group is tokenized and built the first time its key is read, so
+    a request that only looks at `page` never pays for its `filter[...]`
+    parameters.
+
+    >>> result = parse('page=2&filter[status]=open', lazy=True)
+    >>> result['page']
+    '2'
+    >>> result.materialize()
+    {'page': '2', 'filter': {'status': 'open'}}
+    """
+
+    def __init__(self, data, **kwargs):
+        self._parser = parser = QueryStringParser(**kwargs)
+        self._groups = groups = {}
+        self._keys = keys = []
+        self._values = {}
+
+        # pairs in input order, kept only once a key turns up that may
+        # land under another name than the one it is grouped by
+        self._ordered = None
+        ordered = []
+
+        limits = parser.limits
+        count = 0
+        for key, value in parser.pairs(data):
+            if limits is not None:
+                count += 1
+                limits.check_pair(count, key, value)
+
+            name = key.replace(" ", "")
+            if not name:
+                # parse() drops pairs without a key
+                continue
+            ordered.append((key, value))
+
+            if '[' in name and _unclosed(name):
+                self._ordered = ordered
+                continue
+
+            match = _TOP_LEVEL_END.search(name)
+            if match is not None:
+                name = name[:match.start()]
+
+            group = groups.get(name)
+            if group is None:
+                group = groups[name] = []
+                keys.append(name)
+            group.append((key, value))
+
+    def __getitem__(self, name):
+        if self._ordered is not None:
+            self._build_all()
+
+        values = self._values
+        if name not in values and name in self._groups:
+            self._build(name)
+        return values[name]
+
+    def __iter__(self):
+        if self._ordered is not None:
+            self._build_all()
+        return iter(list(self._keys))
+
+    def __len__(self):
+        if self._ordered is not None:
+            self._build_all()
+        return len(self._keys)
+
+    def __contains__(self, name):
+        if self._ordered is not None:
+            self._build_all()
+        return name in self._values or name in self._groups
+
+    def __repr__(self):
+        return '<LazyResult %r>' % (self._keys,)
+
+    def materialize(self):
+        """
+        Build every remaining group and return the result as a plain dict,
+        identical to what `parse(data)` returns.
+        """
+        if self._ordered is not None:
+            self._build_all()
+
+        for name in list(self._groups):
+            self._build(name)
+
+        values = self._values
+        return dict((name, values[name]) for name in self._keys)
+
+    def _parse(self, pairs):
+        parser = self._parser
+        parser.result = root = {}
+
+        # parse() is called directly since the pairs were already counted
+        # against any limits while grouping
+        for key, value in pairs:
+            try:
+                parser.parse(key, value)
+            except ValueError:
+                root[key] = value
+        return parser._finish()
+
+    def _build(self, name):
+        self._values[name] = self._parse(self._groups.pop(name))[name]
+
+    def _build_all(self):
+        # A key with an unclosed bracket, e.g. `a[b`, may be stored under
+        # any name, so the groups cannot be built apart; everything is
+        # built at once, in input order, on first access instead.
+        root = self._parse(self._ordered)
+        self._ordered = None
+        self._groups = {}
+        self._values = root
+        self._keys = list(root)
+
+
+def _unclosed(key):
+    # whether key leaves a bracket open; one closed too early makes
+    # tokenizing fail instead
+    depth = 0
+    for char in key:
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth > 0
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Parsing the querystrings of an access log in place.
+
+The log is memory-mapped and searched with one bytes regex over the whole
+map, so lines are never split or copied; each querystring found is handed
+to the parser as a memoryview slice of the map, and only its decoded keys
+and values are ever copied out.
+"""
+import mmap
+import re
+from collections import Counter
+from contextlib import closing
+from contextlib import contextmanager
+
+from .querystring import QueryStringParser
+from .columnar import PATH_CACHE_SIZE
+from .columnar import _column_path
+
+#: Finds the querystring of the request line in common and combined format
+#: logs, e.g. "GET /search?q=dogs&page=2 HTTP/1.1".
+DEFAULT_PATTERN = re.compile(br'"[A-Z]+ [^"?\s]*\?([^"\s#]*)')
+
+
+def field_pattern(field):
+    """
+    Returns a pattern for the querystring of the URI in a whitespace
+    separated field of each line, counted from 0 like `awk '{print $(n+1)}'`.
+    """
+    pattern = r'^(?:\S*[ \t]+){%d}[^?\s]*\?([^"\s#]*)' % field
+    return re.compile(pattern.encode('ascii'), re.MULTILINE)
+
+
+def scan_log(path, pattern=None, field=None, **kwargs):
+    """
+    Lazily parse the querystring of every request in the log at path,
+    yielding results in file order.
+
+    >>> for result in scan_log('/var/log/nginx/access.log'):
+    ...     pass
+
+    By default querystrings are found in the quoted request line; field
+    picks a whitespace separated field instead, and pattern is any bytes
+    regex whose first group is the querystring. Other keyword arguments
+    are passed to QueryStringParser.
+    """
+    # The span and pair readers are generators scanning the map; closing
+    # them drops their buffer exports even while a traceback still holds
+    # their frames, so the slice and the map can always be released.
+    with _mapped(path) as view, closing(_spans(view, pattern, field)) as spans:
+        for start, end in spans:
+            obj = QueryStringParser(**kwargs)
+            with _sliced(view, start, end) as query:
+                with closing(obj.pairs(query)) as pairs:
+                    obj._consume(pairs)
+            yield obj._finish()
+
+
+def count_log(path, key, pattern=None, field=None, **kwargs):
+    """
+    Count the values of one key path across every request in the log at
+    path, returning a Counter of value to occurrences.
+
+    >>> count_log('access.log', 'utm.source').most_common(3)
+    [('mail', 1204), ('ads', 311), ('social', 87)]
+
+    key is a flattened path as named by parse_columns, e.g. `items[].sku`,
+    and every occurrence of it is counted. No result is built for any
+    request. pattern, field and other keyword arguments are as for
+    scan_log.
+    """
+    parser = QueryStringParser(**kwargs)
+    limits = parser.limits
+    names = {}
+    counts = Counter()
+
+    with _mapped(path) as view, closing(_spans(view, pattern, field)) as spans:
+        for start, end in spans:
+            parser._pair_count = 0
+            with _sliced(view, start, end) as query:
+                with closing(parser.pairs(query)) as pairs:
+                    for name, value in pairs:
+                        if limits is not None:
+                            parser._pair_count += 1
+                            limits.check_pair(parser._pair_count, name, value)
+
+                        column = names.get(name)
+                        if column is None:
+                            if len(names) >= PATH_CACHE_SIZE:
+                                names.clear()
+                            column = names[name] = _column_path(parser,
+                                                                name)[0]
+                        if column == key:
+                            counts[value] += 1
+
+    return counts
+
+
+def _spans(view, pattern, field):
+    if pattern is None:
+        pattern = DEFAULT_PATTERN if field is None else field_pattern(field)
+    elif field is not None:
+        raise TypeError('Give either a pattern or a field, not both')
+
+    for match in pattern.finditer(view):
+        yield match.span(1)
+
+
+@contextmanager
+def _mapped(path):
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            mapped = b''
+
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+
+@contextmanager
+def _sliced(view, start, end):
+    query = view[start:end]
+    try:
+        yield query
+    finally:
+        query.release()
+
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import sys
+import threading
+from collections import OrderedDict
+
+from .querystring import QueryStringParser
+from .compact import sizeof
+from .compact import to_python
+
+
+class ResultCache(object):
+    """
+    Bounded, least-recently-used cache of whole parse results, keyed by the
+    raw querystring.
+
+    >>> cache = ResultCache(maxsize=512, max_bytes=1 << 20)
+    >>> parse('page=2&sort=asc', result_cache=cache)
+
+    Results are stored compact (see pyquerystring.compact). With immutable
+    set, that shared, read-only result is returned as is; otherwise each
+    call gets its own plain dict tree built from it.
+
+    Entries are weighed by an estimate of the memory they hold, their
+    querystring plus every node and value of the result (see
+    compact.sizeof), and max_bytes caps the total. Inputs
+    longer than max_input_length, inputs that are not str or bytes, and
+    calls made with bypass set skip the cache entirely. Any other keyword
+    arguments are the options results are parsed with.
+    """
+
+    def __init__(self, maxsize=1024, max_bytes=None, max_input_length=4096,
+                 immutable=True, **kwargs):
+        kwargs['compact'] = True
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.max_input_length = max_input_length
+        self.immutable = immutable
+        self.options = kwargs
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def parse(self, data, bypass=False):
+        if (bypass or not isinstance(data, (str, bytes)) or
+                (self.max_input_length is not None and
+                 len(data) > self.max_input_length)):
+            with self._lock:
+                self.bypassed += 1
+            return self._output(QueryStringParser(data, **self.options).result)
+
+        result = None
+        with self._lock:
+            entry = self._data.pop(data, None)
+            if entry is not None:
+                # entries are (result, size) pairs
+                self._data[data] = entry
+                result = entry[0]
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if result is None:
+            result = QueryStringParser(data, **self.options).result
+            self._store(data, result)
+        return self._output(result)
+
+    def _output(self, result):
+        return result if self.immutable else to_python(result)
+
+    def _store(self, data, result):
+        size = sys.getsizeof(data) + sizeof(result)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            entries = self._data
+            if data in entries:
+                return
+            entries[data] = (result, size)
+            self.bytes += size
+
+            while entries and (
+                    len(entries) > self.maxsize or
+                    (self.max_bytes is not None and
+                     self.bytes > self.max_bytes)):
+                _, (_, evicted) = entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bypassed': self.bypassed,
+            'size': len(self._data),
+            'bytes': self.bytes,
+        }
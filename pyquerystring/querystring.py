@@ -1,13 +1,204 @@
 # -*- coding: utf-8 -*-
+import re
+
 from .compat import parse_qsl
-from .compat import is_py3
+from .compat import unquote_plus
+from .compat import unquote_to_bytes
+from .cache import default_key_cache
+from .adapters import get_adapter
+from .compact import compact
+
+BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+# one key=value pair of an urlencoded buffer; pairs without `=` never match
+_BYTES_PAIR = re.compile(br'([^&=]*)=([^&]*)')
+_STRING_PAIR = re.compile(r'[^&]+')
+
+
+def parse(data, lazy=False, result_cache=None, **kwargs):
+    if result_cache is not None:
+        if lazy or kwargs:
+            raise TypeError('Parser options for cached results are given '
+                            'to the ResultCache')
+        return result_cache.parse(data)
 
+    if lazy:
+        from .lazy import LazyResult
+        return LazyResult(data, **kwargs)
 
-def parse(data):
-    obj = QueryStringParser(data)
+    obj = QueryStringParser(data, **kwargs)
     return obj.result
 
 
+def parse_stream(source, chunk_size=65536, **kwargs):
+    """
+    Parse an application/x-www-form-urlencoded body incrementally.
+
+    source may be a file-like object, which is read chunk_size bytes at a
+    time, or any iterable of bytes chunks.
+
+    >>> parse_stream(environ['wsgi.input'])
+    """
+    obj = QueryStringParser(**kwargs)
+    read = getattr(source, 'read', None)
+
+    if read is None:
+        for chunk in source:
+            obj.feed(chunk)
+    else:
+        while True:
+            chunk = read(chunk_size)
+            if not chunk:
+                break
+            obj.feed(chunk)
+
+    return obj.close()
+
+
+class QueryStringLimitError(Exception):
+    """
+    Raised when input exceeds one of the bounds configured with Limits.
+    The name of the offending bound is available as `limit`.
+    """
+
+    def __init__(self, limit, message):
+        Exception.__init__(self, message)
+        self.limit = limit
+
+
+class Limits(object):
+    """
+    Upper bounds a QueryStringParser enforces while it reads its input.
+    Every bound defaults to None, meaning unlimited.
+
+    >>> parse(qs, limits=Limits(max_pairs=100, max_depth=5, max_index=999))
+
+    Each bound is checked before the work it guards is done: key and value
+    lengths before a key is tokenized, nesting depth and array indices
+    before any container is created for a key.
+    """
+
+    def __init__(self, max_pairs=None, max_depth=None, max_index=None,
+                 max_key_length=None, max_value_length=None,
+                 max_input_size=None):
+        self.max_pairs = max_pairs
+        self.max_depth = max_depth
+        self.max_index = max_index
+        self.max_key_length = max_key_length
+        self.max_value_length = max_value_length
+        self.max_input_size = max_input_size
+
+    def check_size(self, size):
+        if self.max_input_size is not None and size > self.max_input_size:
+            raise QueryStringLimitError(
+                'max_input_size',
+                'Querystring exceeds %d bytes' % self.max_input_size)
+
+    def check_pair(self, count, key, value):
+        if self.max_pairs is not None and count > self.max_pairs:
+            raise QueryStringLimitError(
+                'max_pairs',
+                'Querystring has more than %d pairs' % self.max_pairs)
+
+        if self.max_key_length is not None and len(key) > self.max_key_length:
+            raise QueryStringLimitError(
+                'max_key_length',
+                'Querystring key exceeds %d characters' % self.max_key_length)
+
+        if (self.max_value_length is not None and
+                len(value) > self.max_value_length):
+            raise QueryStringLimitError(
+                'max_value_length',
+                'Querystring value exceeds %d characters'
+                % self.max_value_length)
+
+    def check_path(self, path):
+        max_index = self.max_index
+        if max_index is not None:
+            for token_type, name in path:
+                if (token_type == QueryStringToken.KEY and
+                        type(name) is int and name > max_index):
+                    raise QueryStringLimitError(
+                        'max_index',
+                        'Querystring array index exceeds %d' % max_index)
+
+        if self.max_depth is not None and path_depth(path) > self.max_depth:
+            raise QueryStringLimitError(
+                'max_depth',
+                'Querystring key nests deeper than %d' % self.max_depth)
+
+
+def path_depth(path):
+    """
+    Returns the number of containers a compiled key path creates below the
+    root: one per container token plus one per pair of adjacent keys.
+    """
+    depth = 0
+    after_key = False
+    for token_type, name in path:
+        if token_type == QueryStringToken.KEY:
+            if after_key:
+                depth += 1
+            after_key = True
+        else:
+            depth += 1
+            after_key = False
+    return depth
+
+
+def is_flat_key(key):
+    """
+    Whether key is a single name, e.g. `page`, which is stored as is
+    rather than tokenized.
+    """
+    return (key != '' and '[' not in key and '.' not in key and
+            ']' not in key and ' ' not in key)
+
+
+def key_filter(include=None, exclude=None):
+    """
+    Returns a predicate telling whether a decoded key is wanted, or None
+    when neither include nor exclude is given.
+
+    Each is a prefix or list of prefixes. A prefix matches the key itself
+    and anything nested below it, so `auth` matches `auth`, `auth.user`
+    and `auth[token]` but not `author`. A prefix ending in `.` or `[`
+    matches only keys nested below it. An empty list matches nothing, so
+    `include=[]` keeps no key and `exclude=[]` drops none.
+    """
+    if include is None and exclude is None:
+        return None
+
+    include = _prefix_pattern(include)
+    exclude = _prefix_pattern(exclude)
+
+    def wanted(key):
+        if include is not None and include.match(key) is None:
+            return False
+        return exclude is None or exclude.match(key) is None
+
+    return wanted
+
+
+def _prefix_pattern(prefixes):
+    if prefixes is None:
+        return None
+    if isinstance(prefixes, str):
+        prefixes = [prefixes]
+    if not prefixes:
+        # an empty list matches no key at all, rather than every key as
+        # an empty pattern would
+        return re.compile(r'(?!)')
+
+    patterns = []
+    for prefix in prefixes:
+        if prefix[-1:] in ('.', '['):
+            patterns.append(re.escape(prefix))
+        else:
+            patterns.append(re.escape(prefix) + r'(?:[.\[]|$)')
+    return re.compile('|'.join(patterns))
+
+
 class QueryStringToken(object):
 
     ARRAY = "ARRAY"
@@ -23,40 +214,381 @@ class DefaultList(list):
         list.__setitem__(self, index, value)
 
 
+class SparseArray(object):
+    """
+    Array node used while pairs are being inserted. Explicit indices and
+    `[]` pushes are collected separately, in arrival order, and only laid
+    out as a DefaultList once parsing is finished, so neither the input
+    order nor the size of the largest index matters until then.
+    """
+
+    __slots__ = ('indexed', 'pushed')
+
+    def __init__(self):
+        self.indexed = {}
+        self.pushed = []
+
+    def dense(self):
+        indexed = self.indexed
+        if indexed:
+            items = DefaultList([None] * (max(indexed) + 1))
+            for index, value in indexed.items():
+                list.__setitem__(items, index, value)
+        else:
+            items = DefaultList()
+        # pushes always follow the explicit indices
+        items.extend(self.pushed)
+        return items
+
+
+CONTAINERS = (dict, SparseArray)
+_MISSING = object()
+
+
+def _child(ref, key, factory):
+    # Returns the container stored under key in ref, replacing anything
+    # that is not already a container of the requested type.
+    if type(ref) is SparseArray:
+        if key is None:
+            node = factory()
+            ref.pushed.append(node)
+            return node
+        ref = ref.indexed
+
+    node = ref.get(key)
+    if type(node) is not factory:
+        node = ref[key] = factory()
+    return node
+
+
+def _assign(ref, key, value):
+    # A scalar never replaces a container, so the result does not depend on
+    # whether `a=1` arrives before or after `a[0]=2`.
+    if type(ref) is SparseArray:
+        if key is None:
+            ref.pushed.append(value)
+            return
+        ref = ref.indexed
+
+    if type(ref.get(key)) not in CONTAINERS:
+        ref[key] = value
+
+
+def _materialize(root, stats=None):
+    # Replace every SparseArray below root with its dense DefaultList,
+    # top down and without recursion so deep trees are safe.
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        keys = node.keys() if type(node) is dict else range(len(node))
+        for key in keys:
+            child = node[key]
+            if type(child) is SparseArray:
+                if stats is not None:
+                    stats.record_array(child)
+                child = node[key] = child.dense()
+                stack.append(child)
+            elif type(child) is dict:
+                stack.append(child)
+    return root
+
+
+def _materialized(node):
+    # the dense equivalent of a single node
+    if type(node) is SparseArray:
+        node = node.dense()
+    if type(node) in (dict, DefaultList):
+        _materialize(node)
+    return node
+
+
+def _merge(target, source, keep_existing):
+    # Merge the unmaterialized tree source into the materialized tree
+    # target in place, visiting only the nodes of source.
+    stack = [(target, source)]
+    while stack:
+        target, source = stack.pop()
+
+        if type(source) is dict:
+            entries = source.items()
+            pushed = ()
+        else:
+            entries = source.indexed.items()
+            # pushes follow the explicit indices, as they do in parse
+            pushed = () if keep_existing else source.pushed
+
+        for key, value in entries:
+            if type(target) is dict:
+                existing = target.get(key)
+            else:
+                existing = target[key] if key < len(target) else None
+
+            if existing is None:
+                target[key] = _materialized(value)
+            elif type(value) is dict and type(existing) is dict:
+                stack.append((existing, value))
+            elif type(value) is SparseArray and isinstance(existing, list):
+                stack.append((existing, value))
+            elif type(existing) in (dict, DefaultList):
+                # a scalar never replaces a container
+                if type(value) in CONTAINERS and not keep_existing:
+                    target[key] = _materialized(value)
+            elif type(value) in CONTAINERS or not keep_existing:
+                target[key] = _materialized(value)
+
+        for value in pushed:
+            target.append(_materialized(value))
+
+
 class QueryStringParser(object):
 
-    def __init__(self, data):
+    #: Engines accepted by the `engine` argument. `parse_qsl` decodes every
+    #: pair up front; `single_pass` scans the raw string once, inserting
+    #: each pair as soon as it is decoded.
+    ENGINES = ('parse_qsl', 'single_pass')
+
+    #: Values accepted by the `precedence` argument of merge().
+    PRECEDENCES = ('new', 'existing')
+
+    #: Whether single name keys may skip process(); subclasses that
+    #: override process() or parse() for every pair must turn this off.
+    _flat_fast_path = True
+
+    def __init__(self, data=None, key_cache=None, engine='parse_qsl',
+                 charset='utf-8', errors='replace', limits=None,
+                 compact=False, stats=None, include=None, exclude=None,
+                 interning=None):
+        if engine not in self.ENGINES:
+            raise ValueError('Unknown engine: %r' % (engine,))
+
         self.result = {}
+        self.key_cache = default_key_cache if key_cache is None else key_cache
+        self.engine = engine
+        self.charset = charset
+        self.errors = errors
+        self.limits = limits
+        self.compact = compact
+        self.stats = stats
+        self.include = include
+        self.exclude = exclude
+        self.interning = interning
+        self._wanted = key_filter(include, exclude)
+        self._pair_count = 0
+        self._pending = []
+        self._fed = 0
+
+        if stats is not None:
+            stats.attach(self)
+
+        if data is None:
+            # incremental mode, see feed() and close()
+            return
+
+        self._consume(self.pairs(data))
+        self._finish()
+
+    def pairs(self, data):
+        """
+        Returns an iterable of the decoded, stripped (key, value) pairs in
+        data, using whichever reader suits its type.
+        """
+        limits = self.limits
+        if limits is not None and isinstance(data, (str,) + BUFFER_TYPES):
+            limits.check_size(len(data))
 
         if isinstance(data, str):
-            sorted_pairs = self._sorted_from_string(data)
+            # filtering needs the single pass reader to skip the values of
+            # unwanted pairs undecoded, and limits need it to stop reading
+            # before parse_qsl has split and decoded the whole input
+            if (self.engine == 'single_pass' or self._wanted is not None or
+                    limits is not None):
+                return self._pairs_single_pass(data)
+            return self._pairs_from_string(data)
+        elif isinstance(data, BUFFER_TYPES):
+            return self._pairs_from_bytes(data)
+
+        pairs = self._pairs_from_obj(data)
+        if self._wanted is not None:
+            wanted = self._wanted
+            pairs = ((k, v) for k, v in pairs if wanted(k))
+        return pairs
+
+    def feed(self, chunk):
+        """
+        Parse another chunk of an urlencoded body. Pairs and percent-escapes
+        may be split across chunks; anything after the last `&` is held
+        back until the next chunk or close().
+
+        >>> obj = QueryStringParser()
+        >>> obj.feed(b'dog[0]=lu')
+        >>> obj.feed(b'cy&dog[1]=radar')
+        >>> obj.close()
+        {'dog': ['lucy', 'radar']}
+        """
+        if isinstance(chunk, memoryview):
+            chunk = chunk.tobytes()
+
+        if self.limits is not None:
+            self._fed += len(chunk)
+            self.limits.check_size(self._fed)
+
+        end = chunk.rfind(b'&')
+        if end < 0:
+            self._pending.append(chunk)
+            return
+
+        pending = self._pending
+        if pending:
+            pending.append(chunk[:end])
+            head = b''.join(pending)
         else:
-            sorted_pairs = self._sorted_from_obj(data)
-        [self.process(k, v) for k, v in sorted_pairs]
-
-    def _sorted_from_string(self, data):
-        stage1 = parse_qsl(data)
-        stage2 = [(x[0].strip(), x[1].strip()) for x in stage1]
-        return sorted(stage2, key=lambda p: p[0])
-
-    def _sorted_from_obj(self, data):
-        # data is a list of the type generated by parse_qsl
-        if isinstance(data, list):
-            items = data
+            head = chunk[:end]
+        self._pending = [chunk[end + 1:]]
+        self._consume(self._pairs_from_bytes(head))
+
+    def close(self):
+        """
+        Parse whatever feed() has held back and return the finished result.
+        """
+        tail = b''.join(self._pending)
+        self._pending = []
+        self._consume(self._pairs_from_bytes(tail))
+        return self._finish()
+
+    def merge(self, data, precedence='new'):
+        """
+        Parse data into the existing result in place and return it. The
+        work done is proportional to the pairs in data, not to the result.
+
+        >>> obj = QueryStringParser(request.query_string)
+        >>> obj.merge(request.body)
+        >>> obj.merge('page=1&sort=asc', precedence='existing')
+
+        With precedence `new`, scalars in data replace existing scalars and
+        `[]` pushes append to existing arrays. With `existing`, existing
+        scalars are kept and pushes into existing arrays are dropped, which
+        suits defaults. Either way objects are merged key by key, indices
+        are merged element by element, and a scalar never replaces a
+        container.
+        """
+        if precedence not in self.PRECEDENCES:
+            raise ValueError('Unknown precedence: %r' % (precedence,))
+        if self.compact:
+            raise TypeError('Compact results are immutable')
+
+        result = self.result
+        self.result = {}
+        try:
+            self._consume(self.pairs(data))
+            _merge(result, self.result, precedence == 'existing')
+        finally:
+            self.result = result
+        return result
+
+    def _consume(self, pairs):
+        if self.interning is not None:
+            pairs = self.interning.pairs(pairs)
+
+        if self.stats is not None:
+            return self.stats.consume(self, pairs)
+
+        # Keys that are a single name, by far the most common kind, are
+        # stored directly; see store_flat(), inlined here
+        process = self.process
+        flat = self._flat_fast_path
+        result = self.result
+        limits = self.limits
+        for key, value in pairs:
+            if flat and is_flat_key(key):
+                if limits is not None:
+                    self._pair_count += 1
+                    limits.check_pair(self._pair_count, key, value)
+                if type(result.get(key)) not in CONTAINERS:
+                    result[key] = value
+            else:
+                process(key, value)
+
+    def store_flat(self, key, value):
+        """
+        Assign the value of a single name key, by far the most common kind,
+        directly; the result is the same as going through process().
+        """
+        limits = self.limits
+        if limits is not None:
+            self._pair_count += 1
+            limits.check_pair(self._pair_count, key, value)
+
+        result = self.result
+        if type(result.get(key)) not in CONTAINERS:
+            result[key] = value
+
+    def _finish(self):
+        # called once every pair has been processed
+        stats = self.stats
+        if stats is not None:
+            started = stats.timer()
+
+        if self.compact:
+            # compacted straight from the sparse arrays, which are never
+            # laid out as lists
+            result = self.result = compact(self._prepare(), stats)
+        else:
+            result = self._build()
+
+        if stats is not None:
+            stats.finish(started)
+        return result
+
+    def _prepare(self):
+        # the working tree, sparse arrays and all, once every pair is in
+        return self.result
+
+    def _build(self):
+        return _materialize(self._prepare(), self.stats)
+
+    def _pairs_from_bytes(self, data):
+        # Works on bytes, bytearray and memoryview alike; only each matched
+        # key and value is copied out of the buffer, and only those are
+        # decoded with the configured charset.
+        charset = self.charset
+        errors = self.errors
+        wanted = self._wanted
+        for match in _BYTES_PAIR.finditer(data):
+            key, value = match.groups()
+            if not value:
+                continue
+            key = unquote_to_bytes(key.replace(b'+', b' '))
+            key = key.decode(charset, errors).strip()
+            if wanted is not None and not wanted(key):
+                continue
+            value = unquote_to_bytes(value.replace(b'+', b' '))
+            yield key, value.decode(charset, errors).strip()
+
+    def _pairs_single_pass(self, data):
+        wanted = self._wanted
+        if self.limits is None:
+            pairs = data.split('&')
         else:
-            # complex objects:
-            try:
-                # django.http.QueryDict,
-                items = [(i[0], j) for i in data.lists() for j in i[1]]
-            except AttributeError:
-                # webob.multidict.MultiDict
-                # werkzeug.datastructures.MultiDict
-                if is_py3:
-                    items = data.items()
-                else:
-                    items = data.iteritems()
-
-        return sorted(items, key=lambda p: p[0])
+            # found one at a time, so max_pairs is enforced before the rest
+            # of the input is split
+            pairs = (match.group() for match in _STRING_PAIR.finditer(data))
+
+        for pair in pairs:
+            key, sep, value = pair.partition('=')
+            if not value:
+                continue
+            key = unquote_plus(key).strip()
+            if wanted is not None and not wanted(key):
+                continue
+            yield key, unquote_plus(value).strip()
+
+    def _pairs_from_string(self, data):
+        return ((k.strip(), v.strip()) for k, v in parse_qsl(data))
+
+    def _pairs_from_obj(self, data):
+        # lists of pairs, framework multidicts and anything registered
+        # with adapters.register_adapter
+        return get_adapter(data)(data)
 
     def process(self, key, value):
         """
@@ -67,8 +599,16 @@ class QueryStringParser(object):
         >>> self.process('id[0]', 'foo')
         self.result['id'][0] = 'foo'
 
+        Arrays are held as SparseArray nodes until the parser materializes
+        the result.
+
         """
 
+        limits = self.limits
+        if limits is not None:
+            self._pair_count += 1
+            limits.check_pair(self._pair_count, key, value)
+
         try:
             self.parse(key, value)
         except ValueError:
@@ -80,83 +620,87 @@ class QueryStringParser(object):
         """
 
         ref = self.result
-        tokens = self.tokens(key)
+        pending = _MISSING
+        path = self.compile(key)
+
+        if self.limits is not None:
+            self.limits.check_path(path)
+
+        for token_type, name in path:
+            if token_type == QueryStringToken.KEY:
+                if pending is not _MISSING:
+                    # two keys in a row, e.g. dog[0]name
+                    ref = _child(ref, pending, dict)
+                pending = name
+                continue
 
-        for token in tokens:
-            token_type, key = token
             if token_type == QueryStringToken.ARRAY:
-                if key not in ref:
-                    ref[key] = DefaultList()
-                ref = ref[key]
-
-            elif token_type == QueryStringToken.OBJECT:
-                if key not in ref:
-                    ref[key] = {}
-                ref = ref[key]
-
-            elif token_type == QueryStringToken.KEY:
-                try:
-                    if ref[key] is None or type(ref[key]) not in (DefaultList, dict):
-                        raise KeyError
-                    # This key exists as list or dict. Traverse down the tree.
-                    ref = ref[key]
-                    next(tokens)
-                # TypeError is for pet[]=lucy&pet[]=ollie
-                # if the array key is empty a type error will be raised
-                except (IndexError, KeyError, TypeError):
-                    # the index didn't exist
-                    # so we look ahead to see what we are setting
-                    # there is not a next token
-                    # set the value
-                    try:
-                        next_token = next(tokens)
-                        if next_token[0] == QueryStringToken.ARRAY:
-                            ref[key] = DefaultList()
-                            ref = ref[key]
-                        elif next_token[0] == QueryStringToken.OBJECT:
-                            try:
-                                ref[key] = {}
-                            except IndexError:
-                                ref.append({})
-
-                            ref = ref[key]
-                    except StopIteration:
-                        if key is None:
-                            ref.append(value)
-                        else:
-                            ref[key] = value
-                        return
+                factory = SparseArray
+            else:
+                factory = dict
+
+            # A container token directly after a key describes the value
+            # stored under that key, e.g. the OBJECT in dog[0].name
+            if pending is _MISSING:
+                ref = _child(ref, name, factory)
+            else:
+                ref = _child(ref, pending, factory)
+                pending = _MISSING
+
+        if pending is not _MISSING:
+            _assign(ref, pending, value)
 
     def tokens(self, key):
         """
         Returns an iterator of the array elements (tokens) of a given key
         """
-        buf = ""
+        return iter(self.compile(key))
+
+    def compile(self, key):
+        """
+        Returns the tokens of a given key as a tuple, consulting the key
+        cache first so repeated key shapes are only tokenized once.
+        """
+        cache = self.key_cache
+        path = cache.get(key)
+        if path is None:
+            path = tuple(self._tokenize(key))
+            if self.interning is not None:
+                # the names become keys of the result, and outlive the path
+                # once it is evicted from the cache
+                intern = self.interning.intern
+                path = tuple((token_type, intern(name))
+                             if type(name) is str else (token_type, name)
+                             for token_type, name in path)
+            cache.set(key, path)
+        return path
 
+    def _tokenize(self, key):
         # remove white space from any keys
         key = key.replace(" ", "")
 
-        # Creates iterator of next chars
+        # buf is always a contiguous slice of key, so track where it
+        # starts rather than growing a string one char at a time
+        start = 0
         in_array_bracket = 0
         pre_array_buffer = ''
-        for char in key:
+        for index, char in enumerate(key):
             if char == "[":
                 in_array_bracket += 1
                 if in_array_bracket == 1:
-                    pre_array_buffer = buf
-                    buf = ""
-                else:
-                    buf = buf + char
+                    pre_array_buffer = key[start:index]
+                    start = index + 1
 
             elif char == "." and in_array_bracket == 0:
-                yield QueryStringToken.OBJECT, buf
-                buf = ""
+                yield QueryStringToken.OBJECT, key[start:index]
+                start = index + 1
 
             elif char == "]":
                 in_array_bracket -= 1
                 if in_array_bracket < 0:
                     raise IOError('Non-matching close bracket in querystring')
                 if in_array_bracket == 0:
+                    buf = key[start:index]
                     if buf.isdigit():
                         yield QueryStringToken.ARRAY, pre_array_buffer
                         yield QueryStringToken.KEY, int(buf)
@@ -166,13 +710,7 @@ class QueryStringParser(object):
                     else:
                         yield QueryStringToken.OBJECT, pre_array_buffer
                         yield QueryStringToken.KEY, buf
-                    buf = ""
-                else:
-                    buf = buf + char
-            else:
-                buf = buf + char
+                    start = index + 1
 
-        if len(buf) > 0:
-            yield QueryStringToken.KEY, buf
-        else:
-            return
+        if start < len(key):
+            yield QueryStringToken.KEY, key[start:]
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+from .querystring import QueryStringParser
+from .querystring import QueryStringToken
+from .querystring import SparseArray
+
+
+BOOLEAN_STATES = {
+    '1': True, 'true': True, 'yes': True, 'on': True,
+    '0': False, 'false': False, 'no': False, 'off': False,
+}
+
+
+class QueryStringSchemaError(Exception):
+    """
+    Raised when a declared value cannot be coerced to its type.
+    """
+
+    def __init__(self, key, value, message):
+        Exception.__init__(self, message)
+        self.key = key
+        self.value = value
+
+
+class Field(object):
+    """
+    A leaf of a Schema: the type values are coerced to, and the default
+    used when the key is absent from its enclosing object.
+
+    type may be any callable taking the value string; bool accepts the
+    usual spellings of true and false.
+    """
+
+    def __init__(self, type=str, default=None):
+        self.type = type
+        self.default = default
+
+    def coerce(self, value):
+        if self.type is bool:
+            return BOOLEAN_STATES[value.lower()]
+        return self.type(value)
+
+
+class _Object(object):
+    def __init__(self, fields):
+        self.fields = fields
+
+
+class _Array(object):
+    def __init__(self, item):
+        self.item = item
+
+
+def _compile(spec):
+    if isinstance(spec, Field):
+        return spec
+    if isinstance(spec, dict):
+        return _Object(dict((k, _compile(v)) for k, v in spec.items()))
+    if isinstance(spec, list):
+        if len(spec) != 1:
+            raise TypeError('Array specs take exactly one item spec')
+        return _Array(_compile(spec[0]))
+    return Field(spec)
+
+
+def _member(node, key):
+    if type(node) is _Object:
+        return node.fields.get(key) if isinstance(key, str) else None
+    if type(node) is _Array and not isinstance(key, str):
+        return node.item
+    return None
+
+
+class Schema(object):
+    """
+    Declares the structure a querystring is expected to have and parses
+    only that structure.
+
+    Objects are dicts of name to spec, arrays are single item lists and
+    anything else is a type or Field:
+
+    >>> schema = Schema({
+    ...     'page': Field(int, default=1),
+    ...     'filter': {'status': str, 'tags': [str]},
+    ...     'items': [{'sku': str, 'qty': int}],
+    ...     'debug': bool,
+    ... })
+    >>> schema.parse('page=2&items[0].qty=3&items[0].sku=a1&utm=x')
+    {'page': 2, 'items': [{'qty': 3, 'sku': 'a1'}]}
+    """
+
+    def __init__(self, spec):
+        self.root = _compile(spec)
+        if type(self.root) is not _Object:
+            raise TypeError('A schema must be declared as a dict')
+
+    def parser(self, data=None, **kwargs):
+        return SchemaParser(self, data, **kwargs)
+
+    def parse(self, data, **kwargs):
+        return SchemaParser(self, data, **kwargs).result
+
+    def resolve(self, path):
+        """
+        Returns the Field a compiled key path leads to, or None when the
+        path is not declared or its containers do not match the schema.
+        """
+        node = self.root
+        pending = None
+        has_pending = False
+
+        for token_type, name in path:
+            if token_type == QueryStringToken.KEY:
+                if has_pending:
+                    node = _member(node, pending)
+                    if type(node) is not _Object:
+                        return None
+                pending = name
+                has_pending = True
+                continue
+
+            node = _member(node, pending if has_pending else name)
+            has_pending = False
+            if token_type == QueryStringToken.ARRAY:
+                if type(node) is not _Array:
+                    return None
+            elif type(node) is not _Object:
+                return None
+
+        if not has_pending:
+            return None
+
+        node = _member(node, pending)
+        return node if type(node) is Field else None
+
+    def apply_defaults(self, result):
+        stack = [(self.root, result)]
+        while stack:
+            node, value = stack.pop()
+            if type(node) is _Array:
+                if isinstance(value, list):
+                    stack.extend((node.item, item) for item in value)
+                elif type(value) is SparseArray:
+                    # a parser's working tree, before arrays are laid out
+                    stack.extend((node.item, item)
+                                 for item in value.indexed.values())
+                    stack.extend((node.item, item) for item in value.pushed)
+                continue
+
+            if not isinstance(value, dict):
+                continue
+
+            for name, child in node.fields.items():
+                if name in value:
+                    stack.append((child, value[name]))
+                elif type(child) is Field and child.default is not None:
+                    default = child.default
+                    value[name] = default() if callable(default) else default
+        return result
+
+
+class SchemaParser(QueryStringParser):
+    """
+    QueryStringParser that coerces declared values as they are inserted and
+    drops undeclared keys before any container is created for them.
+    """
+
+    _flat_fast_path = False
+
+    def __init__(self, schema, data=None, **kwargs):
+        self.schema = schema
+        QueryStringParser.__init__(self, data, **kwargs)
+
+    def parse(self, key, value):
+        try:
+            field = self.schema.resolve(self.compile(key))
+        except ValueError:
+            return
+
+        if field is None:
+            return
+
+        try:
+            value = field.coerce(value)
+        except (KeyError, TypeError, ValueError):
+            raise QueryStringSchemaError(
+                key, value, 'Invalid value for %s: %r' % (key, value))
+
+        QueryStringParser.parse(self, key, value)
+
+    def _prepare(self):
+        return self.schema.apply_defaults(self.result)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+from timeit import default_timer
+
+from .querystring import is_flat_key
+from .querystring import path_depth
+
+_END = object()
+
+
+class ParseStats(object):
+    """
+    Opt-in instrumentation for QueryStringParser.
+
+    >>> stats = ParseStats()
+    >>> parse(qs, stats=stats)
+    >>> stats.as_dict()
+    {'parses': 1, 'pairs': 12, 'decode_time': 2.1e-05, ...}
+
+    Counters and timings accumulate over every parse the object is passed
+    to; use one instance per request to get per-request numbers, or call
+    reset(). callback, when given, is called with the stats object each
+    time a parse finishes.
+
+    Phases are timed separately: decode (reading and percent-decoding
+    pairs), tokenize (compiling keys, including key cache lookups), insert
+    (placing values in the tree) and build (laying out arrays and any
+    compaction). Single name keys take the same fast path as without
+    stats: they are counted in flat_pairs and never tokenized. Parsers
+    without stats take none of these code paths.
+    """
+
+    FIELDS = (
+        'parses', 'pairs', 'flat_pairs', 'max_depth', 'arrays',
+        'array_padding',
+        'key_cache_hits', 'key_cache_misses',
+        'decode_time', 'tokenize_time', 'insert_time', 'build_time',
+    )
+
+    def __init__(self, callback=None, timer=default_timer):
+        self.callback = callback
+        self.timer = timer
+        self.reset()
+
+    def reset(self):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def as_dict(self):
+        return dict((name, getattr(self, name)) for name in self.FIELDS)
+
+    def __repr__(self):
+        return '<ParseStats %r>' % (self.as_dict(),)
+
+    def attach(self, parser):
+        """
+        Instrument parser by shadowing its compile method.
+        """
+        compile = parser.compile
+        cache = parser.key_cache
+        timer = self.timer
+
+        def timed_compile(key):
+            hit = key in cache
+            start = timer()
+            path = compile(key)
+            self.tokenize_time += timer() - start
+
+            if hit:
+                self.key_cache_hits += 1
+            else:
+                self.key_cache_misses += 1
+
+            depth = path_depth(path)
+            if depth > self.max_depth:
+                self.max_depth = depth
+            return path
+
+        parser.compile = timed_compile
+
+    def consume(self, parser, pairs):
+        """
+        Process pairs with parser, timing decoding apart from insertion.
+        """
+        timer = self.timer
+        process = parser.process
+        store = parser.store_flat
+        flat = parser._flat_fast_path
+        iterator = iter(pairs)
+
+        while True:
+            start = timer()
+            pair = next(iterator, _END)
+            decoded = timer()
+            self.decode_time += decoded - start
+            if pair is _END:
+                return
+
+            self.pairs += 1
+            if flat and is_flat_key(pair[0]):
+                store(pair[0], pair[1])
+                self.insert_time += timer() - decoded
+                self.flat_pairs += 1
+                continue
+
+            tokenize_time = self.tokenize_time
+            process(pair[0], pair[1])
+            self.insert_time += (timer() - decoded -
+                                 (self.tokenize_time - tokenize_time))
+
+    def record_array(self, sparse):
+        self.arrays += 1
+        indexed = sparse.indexed
+        if indexed:
+            self.array_padding += max(indexed) + 1 - len(indexed)
+
+    def finish(self, started):
+        self.build_time += self.timer() - started
+        self.parses += 1
+        if self.callback is not None:
+            self.callback(self)
@@ -44,6 +44,7 @@ setup(
     package_data={'': ['LICENSE']},
     include_package_data=True,
     install_requires=requires,
+    python_requires='>=3.6',
     package_dir={'pyquerystring': 'pyquerystring'},
     classifiers=(
         'Development Status :: 5 - Production/Stable',
@@ -52,14 +53,15 @@ setup(
         'Topic :: Internet :: WWW/HTTP',
         'License :: OSI Approved :: Apache Software License',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 2.6',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
     ),
 
 )
@@ -0,0 +1,97 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+from pyquerystring import register_adapter
+
+
+PAIRS = [("dog[]", "lucy"), ("dog[]", "radar"), ("id", "foo")]
+EXPECTED = {"dog": ["lucy", "radar"], "id": "foo"}
+
+
+class QueryDict(object):
+    # django.http.QueryDict
+    def __init__(self, pairs):
+        self._lists = {}
+        for key, value in pairs:
+            self._lists.setdefault(key, []).append(value)
+
+    def lists(self):
+        return iter(self._lists.items())
+
+    def items(self):
+        return ((key, values[-1]) for key, values in self._lists.items())
+
+QueryDict.__module__ = 'django.http.request'
+
+
+class MultiDict(QueryDict):
+    # werkzeug.datastructures.MultiDict, whose items() only returns the
+    # first value of each key unless multi is set
+    def items(self, multi=False):
+        for key, values in self._lists.items():
+            for value in (values if multi else values[:1]):
+                yield key, value
+
+MultiDict.__module__ = 'werkzeug.datastructures'
+
+
+class ImmutableMultiDict(MultiDict):
+    pass
+
+
+class WebObMultiDict(object):
+    # webob.multidict.MultiDict, whose items() returns every pair
+    def __init__(self, pairs):
+        self._items = list(pairs)
+
+    def items(self):
+        return iter(self._items)
+
+WebObMultiDict.__name__ = 'MultiDict'
+WebObMultiDict.__module__ = 'webob.multidict'
+
+
+class RequestArgs(object):
+    def __init__(self, pairs):
+        self.raw = pairs
+
+    def iter_pairs(self):
+        return iter(self.raw)
+
+
+class AdapterSuite(unittest.TestCase):
+
+    def test_list_and_tuple(self):
+        self.assertEqual(parse(PAIRS), EXPECTED)
+        self.assertEqual(parse(tuple(PAIRS)), EXPECTED)
+
+    def test_django(self):
+        self.assertEqual(parse(QueryDict(PAIRS)), EXPECTED)
+
+    def test_werkzeug(self):
+        self.assertEqual(parse(MultiDict(PAIRS)), EXPECTED)
+        self.assertEqual(parse(ImmutableMultiDict(PAIRS)), EXPECTED)
+
+    def test_webob(self):
+        self.assertEqual(parse(WebObMultiDict(PAIRS)), EXPECTED)
+
+    def test_plain_dict(self):
+        self.assertEqual(parse({"dog.name": "lucy"}),
+                         {"dog": {"name": "lucy"}})
+
+    def test_register(self):
+        register_adapter(RequestArgs, lambda data: data.iter_pairs())
+        self.assertEqual(parse(RequestArgs(PAIRS)), EXPECTED)
+
+    def test_register_by_name(self):
+        class Args(RequestArgs):
+            pass
+
+        register_adapter('%s.Args' % __name__, lambda data: data.raw[:1])
+        self.assertEqual(parse(Args(PAIRS)), {"dog": ["lucy"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import asyncio
+import unittest
+import pyquerystring
+from pyquerystring import parse
+
+
+BODY = b"id=foo&dog[1].name=radar&dog[0].name=lucy&name=a+b%20c&pets[]=kiki"
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class AsyncChunks(object):
+    # async iterator written without async syntax so this module still
+    # imports where the async API is unavailable
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        for chunk in self.chunks:
+            return asyncio.sleep(0, result=chunk)
+        raise StopAsyncIteration
+
+
+class AsyncSuite(unittest.TestCase):
+
+    def run_async(self, coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def test_chunks(self):
+        source = AsyncChunks(chunked(BODY, 5))
+        result = self.run_async(pyquerystring.parse_async(source))
+        self.assertEqual(result, parse(BODY))
+
+    def test_offload(self):
+        source = AsyncChunks(chunked(BODY, 5))
+        result = self.run_async(
+            pyquerystring.parse_async(source, offload_threshold=20))
+        self.assertEqual(result, parse(BODY))
+
+    def test_parser_options(self):
+        source = AsyncChunks([b"name=caf%E9"])
+        result = self.run_async(
+            pyquerystring.parse_async(source, charset='latin-1'))
+        self.assertEqual(result["name"], u"caf\xe9")
+
+    def test_asgi_body(self):
+        messages = iter([
+            {'type': 'http.request', 'body': BODY[:10], 'more_body': True},
+            {'type': 'http.request', 'body': BODY[10:], 'more_body': True},
+            {'type': 'http.request', 'body': b'', 'more_body': False},
+        ])
+
+        def receive():
+            return asyncio.sleep(0, result=next(messages))
+
+        source = pyquerystring.asgi_body(receive)
+        result = self.run_async(pyquerystring.parse_async(source))
+        self.assertEqual(result, parse(BODY))
+
+    def test_asgi_disconnect(self):
+        messages = iter([
+            {'type': 'http.request', 'body': BODY[:10], 'more_body': True},
+            {'type': 'http.disconnect'},
+        ])
+
+        def receive():
+            return asyncio.sleep(0, result=next(messages))
+
+        source = pyquerystring.asgi_body(receive)
+        with self.assertRaises(pyquerystring.QueryStringDisconnectError):
+            self.run_async(pyquerystring.parse_async(source))
+
+
+if __name__ == "__main__":
+    unittest.main()
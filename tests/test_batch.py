@@ -0,0 +1,45 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+from pyquerystring import parse_many
+from pyquerystring import KeyPathCache
+
+
+QUERIES = [
+    "id=%d&dog[1].name=radar&dog[0].name=lucy&page.size=%d" % (i, i * 2)
+    for i in range(50)
+]
+
+
+class ParseManySuite(unittest.TestCase):
+
+    def test_serial(self):
+        results = parse_many(QUERIES)
+        self.assertEqual(list(results), [parse(qs) for qs in QUERIES])
+
+    def test_serial_is_lazy(self):
+        def queries():
+            yield "id=1"
+            raise AssertionError("consumed too far")
+
+        self.assertEqual(next(parse_many(queries())), {"id": "1"})
+
+    def test_serial_shares_key_cache(self):
+        cache = KeyPathCache()
+        list(parse_many(QUERIES, key_cache=cache))
+        # single name keys never reach the key cache
+        self.assertEqual(cache.misses, 3)
+
+    def test_workers_preserve_order(self):
+        results = parse_many(QUERIES, workers=2, chunksize=7)
+        self.assertEqual(list(results), [parse(qs) for qs in QUERIES])
+
+    def test_workers_reject_key_cache(self):
+        with self.assertRaises(ValueError):
+            parse_many(QUERIES, workers=2, key_cache=KeyPathCache())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+
+
+QS = "id=foo&dog[1]=radar&dog[0]=lucy&fish.name=robo+fish&sym=%26%3D&empty=&x"
+
+
+class BytesInputSuite(unittest.TestCase):
+
+    def test_bytes(self):
+        self.assertEqual(parse(QS.encode('ascii')), parse(QS))
+
+    def test_bytearray(self):
+        self.assertEqual(parse(bytearray(QS.encode('ascii'))), parse(QS))
+
+    def test_memoryview(self):
+        buf = memoryview(b"xx" + QS.encode('ascii'))[2:]
+        self.assertEqual(parse(buf), parse(QS))
+
+    def test_decodes_keys_and_values(self):
+        result = parse(b"caf%C3%A9[0]=%E2%9C%93")
+        self.assertEqual(result[u"café"], [u"✓"])
+
+    def test_charset_and_errors(self):
+        result = parse(b"name=caf%E9", charset='latin-1')
+        self.assertEqual(result["name"], u"café")
+
+        with self.assertRaises(UnicodeDecodeError):
+            parse(b"name=caf%E9", errors='strict')
+
+        result = parse(b"name=caf%E9", errors='ignore')
+        self.assertEqual(result["name"], "caf")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+from pyquerystring import KeyPathCache
+from pyquerystring import QueryStringParser
+
+
+class KeyPathCacheSuite(unittest.TestCase):
+
+    def test_repeat_keys_hit(self):
+        cache = KeyPathCache()
+        parse("dog[0].name=lucy", key_cache=cache)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 0)
+
+        result = parse("dog[0].name=radar", key_cache=cache)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(result["dog"][0]["name"], "radar")
+
+    def test_compiled_tokens_are_immutable(self):
+        parser = QueryStringParser("", key_cache=KeyPathCache())
+        path = parser.compile("dog[0]")
+        self.assertIsInstance(path, tuple)
+        self.assertEqual(list(parser.tokens("dog[0]")), list(path))
+
+    def test_lru_eviction(self):
+        cache = KeyPathCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_disabled(self):
+        cache = KeyPathCache(maxsize=0)
+        parse("id[0]=1&id[0]=2", key_cache=cache)
+        self.assertEqual(len(cache), 0)
+
+    def test_resize(self):
+        cache = KeyPathCache()
+        parse("a[0]=1&b[0]=2&c[0]=3", key_cache=cache)
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertIn("c[0]", cache)
+
+    def test_long_keys_not_cached(self):
+        cache = KeyPathCache(max_key_length=10)
+        long_key = "a" * 20 + "[0]"
+        result = parse("%s=1&b[0]=2" % long_key, key_cache=cache)
+
+        self.assertEqual(result["a" * 20], ["1"])
+        self.assertNotIn(long_key, cache)
+        self.assertIn("b[0]", cache)
+        self.assertEqual(len(cache), 1)
+
+    def test_default_key_length_bound(self):
+        cache = KeyPathCache()
+        parse("a%s[0]=1" % ("x" * 1000), key_cache=cache)
+        self.assertEqual(len(cache), 0)
+
+    def test_bad_format_not_cached(self):
+        cache = KeyPathCache()
+        with self.assertRaises(IOError):
+            parse("dog[1]]=lucy", key_cache=cache)
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
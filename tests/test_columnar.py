@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import math
+import unittest
+from pyquerystring import parse_columns
+from pyquerystring import Limits
+from pyquerystring import QueryStringLimitError
+
+
+class ParseColumnsSuite(unittest.TestCase):
+
+    def test_flattened_paths(self):
+        columns = parse_columns([
+            "utm.source=mail&page=2",
+            "page=3&filter[status]=open&dog[0]name=lucy",
+        ])
+
+        self.assertEqual(columns.rows, 2)
+        self.assertEqual(columns["utm.source"], ["mail", None])
+        self.assertEqual(columns["page"], ["2", "3"])
+        self.assertEqual(columns["filter.status"], [None, "open"])
+        self.assertEqual(columns["dog[].name"], [None, ["lucy"]])
+
+    def test_array_columns(self):
+        columns = parse_columns([
+            "items[1].sku=b&items[0].sku=a&items[].sku=c",
+            "ids[]=2&ids[0]=1&ids[0]=0&grid[1][0]=y&grid[0][1]=x",
+        ])
+
+        self.assertEqual(columns["items[].sku"], [["a", "b", "c"], None])
+        self.assertEqual(columns["ids[]"], [None, ["0", "2"]])
+        self.assertEqual(columns["grid[][]"], [None, ["x", "y"]])
+
+    def test_pairs_parse_assigns_nothing(self):
+        columns = parse_columns(["=x&a=1", "a.=2", " =3&b[]=4&c[=5"])
+
+        self.assertEqual(columns.rows, 3)
+        self.assertNotIn("", columns)
+        self.assertNotIn("c", columns)
+        self.assertEqual(columns["a"], ["1", None, None])
+        self.assertEqual(columns["b[]"], [None, None, ["4"]])
+
+    def test_missing_marker(self):
+        columns = parse_columns(["a=1", "", "b=2"], missing="")
+
+        self.assertEqual(columns.rows, 3)
+        self.assertEqual(columns["a"], ["1", "", ""])
+        self.assertEqual(columns["b"], ["", "", "2"])
+
+    def test_typed_columns(self):
+        columns = parse_columns(
+            ["page=2&price=1.5", "page=x", "price=3"],
+            types={"page": "l", "price": "d"})
+
+        self.assertEqual(columns["page"].typecode, "l")
+        self.assertEqual(list(columns["page"]), [2, 0, 0])
+        self.assertEqual(columns["price"][0], 1.5)
+        self.assertTrue(math.isnan(columns["price"][1]))
+        self.assertEqual(columns["price"][2], 3.0)
+        self.assertEqual(memoryview(columns["page"]).format, "l")
+
+    def test_typed_missing_marker(self):
+        columns = parse_columns(["page=2", ""], types={"page": "i"},
+                                missing=-1)
+        self.assertEqual(list(columns["page"]), [2, -1])
+
+    def test_typed_array_column(self):
+        self.assertRaises(ValueError, parse_columns, ["ids[]=1"],
+                          types={"ids[]": "l"})
+
+    def test_inputs_and_options(self):
+        columns = parse_columns(
+            [b"auth.user=a&page=2", [("auth.user", "b"), ("x", "y")]],
+            include="auth")
+
+        self.assertEqual(list(columns), ["auth.user"])
+        self.assertEqual(columns["auth.user"], ["a", "b"])
+
+    def test_limits(self):
+        limits = Limits(max_pairs=2)
+        columns = parse_columns(["a=1&b=2", "c=3&d=4"], limits=limits)
+        self.assertEqual(columns.rows, 2)
+
+        self.assertRaises(QueryStringLimitError, parse_columns,
+                          ["a=1&b=2&c=3"], limits=limits)
+
+    def test_empty(self):
+        columns = parse_columns([])
+        self.assertEqual(columns, {})
+        self.assertEqual(columns.rows, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import tracemalloc
+import unittest
+from pyquerystring import parse
+from pyquerystring import Schema
+from pyquerystring import Field
+from pyquerystring import CompactObject
+from pyquerystring import CompactArray
+from pyquerystring import to_python
+
+
+QS = ("id=foo&rows[0].col=a&rows[1].col=b&rows[2].col=c"
+      "&plants.name[0][1]=flower&plants.name[0][0]=tree&gap[9]=x")
+
+
+class CompactSuite(unittest.TestCase):
+
+    def test_equal_to_plain_result(self):
+        result = parse(QS, compact=True)
+        self.assertIsInstance(result, CompactObject)
+        self.assertEqual(result, parse(QS))
+
+    def test_to_python(self):
+        result = to_python(parse(QS, compact=True))
+        self.assertIs(type(result), dict)
+        self.assertIs(type(result["rows"]), list)
+        self.assertIs(type(result["rows"][0]), dict)
+        self.assertEqual(result, parse(QS))
+
+    def test_shared_shapes(self):
+        rows = parse(QS, compact=True)["rows"]
+        self.assertIs(rows[0]._shape, rows[2]._shape)
+
+    def test_sparse_array(self):
+        gap = parse(QS, compact=True)["gap"]
+        self.assertIsInstance(gap, CompactArray)
+        self.assertEqual(len(gap), 10)
+        self.assertEqual(len(gap._values), 1)
+        self.assertEqual(gap[9], "x")
+        self.assertEqual(gap[-1], "x")
+        self.assertEqual(gap[3], None)
+        self.assertEqual(gap[8:], [None, "x"])
+        with self.assertRaises(IndexError):
+            gap[10]
+
+    def test_huge_index_is_not_padded(self):
+        tracemalloc.start()
+        try:
+            result = parse("a[3000000]=x&a[]=y", compact=True)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(peak, 100000)
+        self.assertEqual(len(result["a"]), 3000002)
+        self.assertEqual(result["a"][3000000], "x")
+        self.assertEqual(result["a"][-1], "y")
+        self.assertEqual(len(result["a"]._values), 2)
+
+    def test_immutable(self):
+        result = parse(QS, compact=True)
+        with self.assertRaises(TypeError):
+            result["id"] = "bar"
+        with self.assertRaises(AttributeError):
+            result.extra = 1
+
+    def test_schema(self):
+        schema = Schema({"page": Field(int, default=1), "tags": [str]})
+        result = schema.parse("tags[]=a&junk=1", compact=True)
+        self.assertIsInstance(result, CompactObject)
+        self.assertEqual(result, {"page": 1, "tags": ["a"]})
+
+        schema = Schema({
+            "items": [{"sku": str, "qty": Field(int, default=1)}]})
+        qs = "items[2].sku=a&items[].sku=b"
+        self.assertEqual(schema.parse(qs, compact=True), schema.parse(qs))
+
+
+if __name__ == "__main__":
+    unittest.main()
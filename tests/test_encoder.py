@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import io
+import unittest
+from pyquerystring import parse
+from pyquerystring import stringify
+from pyquerystring import QueryStringEncoder
+
+
+OBJ = {
+    "id": "foo",
+    "dog": [{"name": "lucy", "tags": ["a", "b"]}, {"name": "radar"}],
+    "fish": {"name": "robo fish", "type": "fishz"},
+    "plants": {"name": [["tree", "flower"], ["willow", "fern"]]},
+    "sym": u"&=✓",
+    "odd": {"name.1": "lucy", "2": "radar"},
+    "gap": [None, None, "dexter"],
+}
+
+
+class EncoderSuite(unittest.TestCase):
+
+    def test_round_trip(self):
+        for array_style in QueryStringEncoder.ARRAY_STYLES:
+            for object_style in QueryStringEncoder.OBJECT_STYLES:
+                qs = stringify(OBJ, array_style=array_style,
+                               object_style=object_style)
+                self.assertEqual(parse(qs), OBJ, qs)
+
+    def test_styles(self):
+        obj = {"dog": {"name": "lucy", "tags": ["a", "b"]}}
+        self.assertEqual(
+            stringify(obj), "dog.name=lucy&dog.tags[0]=a&dog.tags[1]=b")
+        self.assertEqual(
+            stringify(obj, array_style='brackets', object_style='brackets'),
+            "dog[name]=lucy&dog[tags][]=a&dog[tags][]=b")
+
+    def test_scalars(self):
+        qs = stringify({"a": 1, "b": True, "c": None, "d": "", "e": b"x y"})
+        self.assertEqual(qs, "a=1&b=true&e=x+y")
+
+    def test_write(self):
+        stream = io.StringIO()
+        QueryStringEncoder().write({"a": "1", "b": ["2"]}, stream)
+        self.assertEqual(stream.getvalue(), "a=1&b[0]=2")
+
+    def test_prefix_cache(self):
+        encoder = QueryStringEncoder()
+        encoder.encode({"dog": [{"name": "lucy"}]})
+        misses = encoder.prefixes.misses
+        encoder.encode({"dog": [{"name": "radar"}]})
+        self.assertEqual(encoder.prefixes.misses, misses)
+
+    def test_names_that_cannot_round_trip(self):
+        for obj in ({"a.b": "x"}, {"": "x"}, {"a b": "x"}, {" a": "x"},
+                    {"a[0]": "x"}, {"a": {"b]": "x"}}, {"a": [{"c d": "x"}]},
+                    {"a": {"": "x"}}):
+            for object_style in QueryStringEncoder.OBJECT_STYLES:
+                with self.assertRaises(ValueError):
+                    stringify(obj, object_style=object_style)
+
+        self.assertEqual(stringify({"a": {"b.c": "x"}}), "a[b.c]=x")
+
+    def test_bad_input(self):
+        with self.assertRaises(TypeError):
+            stringify(["a"])
+        with self.assertRaises(ValueError):
+            QueryStringEncoder(array_style='nope')
+
+
+if __name__ == "__main__":
+    unittest.main()
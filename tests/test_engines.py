@@ -0,0 +1,58 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+
+
+SAMPLES = (
+    "&id=foo&dog=lucy&cat=ollie",
+    "&id=foo& dog[1] = lucy& dog[0] = tucker",
+    "&id=foo&id=foo2",
+    "&id[1]=foo&id[1]=foo2",
+    "&id[1].name=foo&id[1].name=foo2",
+    "&id=foo&dog.name=lucy&dog[color]=brown",
+    "&id=foo&dog2[name]=lucy&dog2[name2]=lucy&dog[ color ]=brown",
+    "&id=foo&dog[name.1]=lucy&dog[name[2]]=radar",
+    "&id=foo&dog[1].name=radar&dog[0].name=lucy",
+    "&id=foo&dog[]=z-lucy&dog[]=radar",
+    "&dog[]=radar&dog[0]=lucy&dog[]=tucker",
+    "&id=foo&dog.name[]=radar&dog.name[]=tucker&dog.name[]=lucy",
+    "&dog[1][1]=dexter&dog[0][1]=radar&dog[1][0]=tucker&dog[0][0]=lucy",
+    "&dog[0][0].name=lucy&dog[0][1].name=ollie&dog[1][0].name=radar",
+    "&id=foo&dog[0].name=lucy&dog[0].attributes[3].type=dog"
+    "&dog[0].attributes[0]=tail&dog[1].name=radar",
+    "&dog[2]=dexter&dog[10]=fido&dog[0]=lucy",
+    "&name=a+b%20c&sym=%26%3D&empty=&noequals",
+    "&plants.name[0][1]=flower&plants.name[0][0]=tree"
+    "&plants.name[1][0]=willow&plants.name[1][1]=fern",
+)
+
+
+class SinglePassEngineSuite(unittest.TestCase):
+
+    def test_matches_parse_qsl_engine(self):
+        for qs in SAMPLES:
+            self.assertEqual(
+                parse(qs, engine='single_pass'), parse(qs), qs)
+
+    def test_percent_decoding(self):
+        result = parse("name=a+b%20c&sym=%26%3D", engine='single_pass')
+        self.assertEqual(result["name"], "a b c")
+        self.assertEqual(result["sym"], "&=")
+
+    def test_push_after_explicit_index(self):
+        result = parse("dog[]=radar&dog[0]=lucy", engine='single_pass')
+        self.assertEqual(result["dog"], ["lucy", "radar"])
+
+    def test_bad_format(self):
+        with self.assertRaises(IOError):
+            parse("&id=foo&dog[1]]=lucy", engine='single_pass')
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            parse("id=foo", engine='nope')
+
+
+if __name__ == "__main__":
+    unittest.main()
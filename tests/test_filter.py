@@ -0,0 +1,67 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+from pyquerystring import ParseStats
+from pyquerystring import QueryStringParser
+
+
+QS = ("auth.user=lucy&auth[token]=abc&author=radar&trace[id]=7"
+      "&trace[span][0]=x&utm.source=mail&page=2&%61uth.role=admin")
+
+
+class FilterSuite(unittest.TestCase):
+
+    def test_include(self):
+        result = parse(QS, include=["auth", "trace"])
+        self.assertEqual(result, {
+            "auth": {"user": "lucy", "token": "abc", "role": "admin"},
+            "trace": {"id": "7", "span": ["x"]},
+        })
+
+    def test_include_single_prefix(self):
+        self.assertEqual(parse(QS, include="page"), {"page": "2"})
+
+    def test_nested_prefix(self):
+        result = parse(QS, include=["trace[span]", "auth."])
+        self.assertEqual(result, {
+            "trace": {"span": ["x"]},
+            "auth": {"user": "lucy", "role": "admin"},
+        })
+
+    def test_exclude(self):
+        result = parse(QS, exclude=["utm", "auth", "trace"])
+        self.assertEqual(result, {"author": "radar", "page": "2"})
+
+    def test_include_and_exclude(self):
+        result = parse(QS, include="auth", exclude="auth[token]")
+        self.assertEqual(result, {"auth": {"user": "lucy", "role": "admin"}})
+
+    def test_empty_lists(self):
+        self.assertEqual(parse(QS, include=[]), {})
+        self.assertEqual(parse(QS, exclude=[]), parse(QS))
+        self.assertEqual(parse(QS.encode('ascii'), include=[]), {})
+        self.assertEqual(parse(QS, include="page", exclude=[]), {"page": "2"})
+
+    def test_bytes_and_stream(self):
+        expected = parse(QS, include="trace")
+        self.assertEqual(parse(QS.encode('ascii'), include="trace"), expected)
+
+        obj = QueryStringParser(include="trace")
+        obj.feed(QS.encode('ascii'))
+        self.assertEqual(obj.close(), expected)
+
+    def test_pairs(self):
+        pairs = [("auth.user", "lucy"), ("page", "2")]
+        self.assertEqual(parse(pairs, include="page"), {"page": "2"})
+
+    def test_skipped_before_tokenizing(self):
+        stats = ParseStats()
+        parse(QS, include="trace", stats=stats)
+        self.assertEqual(stats.pairs, 2)
+        self.assertEqual(stats.key_cache_hits + stats.key_cache_misses, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+from pyquerystring import parse_stream
+from pyquerystring import InternTable
+from pyquerystring import KeyPathCache
+
+
+def fresh(text):
+    # a copy of text that is not already shared with any constant
+    return "".join(list(text))
+
+
+class InternTableSuite(unittest.TestCase):
+
+    def test_intern(self):
+        table = InternTable()
+        first = table.intern(fresh("sort"))
+        second = table.intern(fresh("sort"))
+
+        self.assertIs(first, second)
+        self.assertIn("sort", table)
+        self.assertEqual((table.hits, table.misses), (1, 1))
+
+    def test_results_share_strings(self):
+        table = InternTable()
+        first = parse(fresh("sort=asc&page=20&filter[status]=open"),
+                      interning=table)
+        second = parse(fresh("page=20&sort=asc&filter[status]=open"),
+                       interning=table)
+
+        self.assertEqual(first, parse("sort=asc&page=20&filter[status]=open"))
+        self.assertIs(first["sort"], second["sort"])
+        self.assertIs(first["page"], second["page"])
+        self.assertIs(first["filter"]["status"], second["filter"]["status"])
+
+        key = [k for k in first if k == "sort"][0]
+        self.assertIs(key, [k for k in second if k == "sort"][0])
+
+    def test_token_names_are_interned(self):
+        table = InternTable()
+        cache = KeyPathCache(0)
+        first = parse(fresh("filter[status]=open&page.size=20"),
+                      interning=table, key_cache=cache)
+        second = parse(fresh("filter[status]=done&page.size=20"),
+                       interning=table, key_cache=cache)
+
+        def key(result, name):
+            return [k for k in result if k == name][0]
+
+        self.assertIs(key(first, "filter"), key(second, "filter"))
+        self.assertIs(key(first["filter"], "status"),
+                      key(second["filter"], "status"))
+        self.assertIs(key(first["page"], "size"), key(second["page"], "size"))
+        self.assertNotIn("filter[status]", table)
+        self.assertNotIn("page.size", table)
+
+    def test_long_values_are_not_interned(self):
+        table = InternTable(max_length=4)
+        long_value = "x" * 5
+
+        parse("a=%s&b=abc" % long_value, interning=table)
+        self.assertIn("a", table)
+        self.assertIn("abc", table)
+        self.assertNotIn(long_value, table)
+
+    def test_long_keys_are_not_interned(self):
+        table = InternTable(max_length=4)
+        long_key = "k" * 5
+
+        parse("%s=1&%s.x=2" % (long_key, long_key), interning=table)
+        self.assertNotIn(long_key, table)
+        self.assertIn("x", table)
+
+    def test_bounded(self):
+        table = InternTable(maxsize=2)
+        result = parse("a=1&b=2&c=3", interning=table)
+
+        self.assertEqual(result, {"a": "1", "b": "2", "c": "3"})
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.stats(), {
+            "hits": 0, "misses": 6, "evictions": 4, "size": 2,
+            "maxsize": 2})
+
+    def test_common_strings_after_unique_values(self):
+        table = InternTable()
+        for i in range(5000):
+            parse("sort=asc&ts=%d" % (1700000000000 + i), interning=table)
+
+        first = parse(fresh("page=20&order=desc"), interning=table)
+        second = parse(fresh("page=20&order=desc"), interning=table)
+        self.assertIs(first["order"], second["order"])
+        self.assertIn("order", table)
+        self.assertIn("desc", table)
+        self.assertLessEqual(len(table), table.maxsize)
+
+    def test_stream_and_bytes(self):
+        table = InternTable()
+        first = parse(b"sort=asc", interning=table)
+        second = parse_stream([b"so", b"rt=a", b"sc"], interning=table)
+
+        self.assertIs(first["sort"], second["sort"])
+        self.assertEqual(table.hits, 2)
+
+    def test_clear(self):
+        table = InternTable()
+        parse("a=1", interning=table)
+        table.clear()
+
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.stats()["evictions"], 0)
+        self.assertEqual((table.hits, table.misses), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
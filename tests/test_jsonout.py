@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import json
+import unittest
+from pyquerystring import parse
+from pyquerystring import parse_json
+from pyquerystring import ParseStats
+from pyquerystring import KeyPathCache
+
+from tests.test_engines import SAMPLES
+
+
+class ParseJsonSuite(unittest.TestCase):
+
+    def assertSameJson(self, data, **kwargs):
+        expected = json.dumps(parse(data, **kwargs)).encode('ascii')
+        self.assertEqual(parse_json(data, **kwargs), expected)
+
+    def test_samples(self):
+        for qs in SAMPLES:
+            self.assertSameJson(qs)
+
+    def test_escaping(self):
+        self.assertSameJson(u"name=%22caf%C3%A9%22%5C%0A&emoji=%E2%9C%93")
+
+    def test_nesting(self):
+        self.assertSameJson(
+            "a[3][1].b[]=x&a[0]=y&c.d.e.f=z&g[]=1&g[]=2&h[2][0][]=q")
+
+    def test_empty(self):
+        self.assertEqual(parse_json(""), b"{}")
+
+    def test_bytes_and_pairs(self):
+        self.assertSameJson(b"dog[1]=radar&dog[0]=lucy")
+        self.assertSameJson([("dog[1]", "radar"), ("n", 1), ("m", None)])
+
+    def test_stats(self):
+        qs = "a[3]=1&a[]=2&b=2&c.d[0]=x"
+        seen = []
+        stats = ParseStats(callback=seen.append)
+        parse_json(qs, stats=stats, key_cache=KeyPathCache())
+
+        expected = ParseStats()
+        parse(qs, stats=expected, key_cache=KeyPathCache())
+        for name in ParseStats.FIELDS:
+            if not name.endswith('_time'):
+                self.assertEqual(getattr(stats, name),
+                                 getattr(expected, name), name)
+        self.assertEqual(stats.parses, 1)
+        self.assertEqual(seen, [stats])
+
+    def test_compact_rejected(self):
+        with self.assertRaises(TypeError):
+            parse_json("a=1", compact=True)
+
+    def test_parser_options(self):
+        self.assertSameJson("auth.user=a&page=2", include="auth")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+from pyquerystring import Limits
+from pyquerystring import QueryStringLimitError
+
+
+QS = ("page=2&filter[status]=open&filter.tags[]=a&filter.tags[]=b"
+      "&facets[1].name=size&facets[0].name=color&sort=asc")
+
+
+class LazyResultSuite(unittest.TestCase):
+
+    def test_materialize_matches_parse(self):
+        result = parse(QS, lazy=True)
+        self.assertEqual(result.materialize(), parse(QS))
+        self.assertIs(type(result.materialize()), dict)
+
+    def test_builds_on_access(self):
+        result = parse(QS, lazy=True)
+        self.assertEqual(result["page"], "2")
+        self.assertNotIn("filter", result._values)
+        self.assertEqual(result["filter"]["tags"], ["a", "b"])
+        self.assertIn("filter", result._values)
+
+    def test_mapping(self):
+        result = parse(QS, lazy=True)
+        self.assertEqual(list(result), ["page", "filter", "facets", "sort"])
+        self.assertEqual(len(result), 4)
+        self.assertIn("facets", result)
+        self.assertNotIn("missing", result)
+        self.assertEqual(result.get("missing"), None)
+        self.assertEqual(dict(result), parse(QS))
+
+    def test_keys_without_values(self):
+        result = parse("x[=1&a=2&=3", lazy=True)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(list(result), ["a"])
+        self.assertNotIn("x", result)
+        self.assertEqual(dict(result), parse("x[=1&a=2&=3"))
+
+    def test_unclosed_bracket_keeps_parse_order(self):
+        qs = "b=1&a[b=2&c=3&a[b=4"
+        self.assertEqual(parse(qs, lazy=True).materialize(), parse(qs))
+        self.assertEqual(dict(parse(qs, lazy=True)), {"b": "4", "c": "3"})
+
+        qs = "a[b=1&b.c=2"
+        self.assertEqual(parse(qs, lazy=True)["b"], {"c": "2"})
+
+    def test_errors_deferred_to_access(self):
+        result = parse("id=1&dog[1]]=lucy", lazy=True)
+        self.assertEqual(result["id"], "1")
+        with self.assertRaises(IOError):
+            result["dog"]
+
+    def test_limits(self):
+        with self.assertRaises(QueryStringLimitError):
+            parse(QS, lazy=True, limits=Limits(max_pairs=3))
+
+        result = parse(QS, lazy=True, limits=Limits(max_depth=1))
+        self.assertEqual(result["page"], "2")
+        with self.assertRaises(QueryStringLimitError):
+            result["facets"]
+
+
+if __name__ == "__main__":
+    unittest.main()
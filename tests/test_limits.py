@@ -0,0 +1,75 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import io
+import tracemalloc
+import unittest
+from pyquerystring import parse
+from pyquerystring import parse_stream
+from pyquerystring import Limits
+from pyquerystring import QueryStringLimitError
+
+
+class LimitsSuite(unittest.TestCase):
+
+    def assertLimit(self, limit, qs, **kwargs):
+        with self.assertRaises(QueryStringLimitError) as ctx:
+            parse(qs, limits=Limits(**kwargs))
+        self.assertEqual(ctx.exception.limit, limit)
+
+    def test_within_limits(self):
+        limits = Limits(max_pairs=3, max_depth=2, max_index=1,
+                        max_key_length=12, max_value_length=5,
+                        max_input_size=100)
+        result = parse("id=foo&dog[1].name=lucy&dog[0].name=radar",
+                       limits=limits)
+        self.assertEqual(result["dog"][1]["name"], "lucy")
+
+    def test_max_pairs(self):
+        self.assertLimit('max_pairs', "a=1&b=2&c=3", max_pairs=2)
+
+    def test_max_pairs_stops_reading(self):
+        qs = "&".join("k%d=v" % i for i in range(100000))
+        for engine in ("parse_qsl", "single_pass"):
+            tracemalloc.start()
+            try:
+                with self.assertRaises(QueryStringLimitError):
+                    parse(qs, engine=engine, limits=Limits(max_pairs=10))
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertLess(peak, len(qs) // 10)
+
+    def test_limits_match_unlimited_result(self):
+        qs = "a=1&&b[]=2&c=%20x+y&d&=5&e=f=g"
+        limits = Limits(max_pairs=100)
+        for engine in ("parse_qsl", "single_pass"):
+            self.assertEqual(parse(qs, engine=engine, limits=limits),
+                             parse(qs, engine=engine))
+
+    def test_max_index(self):
+        self.assertLimit('max_index', "a[99999999]=x", max_index=1000)
+
+    def test_max_depth(self):
+        self.assertLimit('max_depth', "a[b][c][d]=x", max_depth=2)
+        self.assertLimit('max_depth', "a.b.c.d=x", max_depth=2)
+        self.assertLimit('max_depth', "a[0][1].c=x", max_depth=2)
+
+    def test_max_key_length(self):
+        self.assertLimit('max_key_length', "abcdef=x", max_key_length=5)
+
+    def test_max_value_length(self):
+        self.assertLimit('max_value_length', "a=abcdef", max_value_length=5)
+
+    def test_max_input_size(self):
+        self.assertLimit('max_input_size', "a=1&b=2", max_input_size=5)
+        self.assertLimit('max_input_size', b"a=1&b=2", max_input_size=5)
+
+    def test_max_input_size_stream(self):
+        with self.assertRaises(QueryStringLimitError):
+            parse_stream(io.BytesIO(b"a=1" * 10), chunk_size=4,
+                         limits=Limits(max_input_size=20))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import mmap
+import re
+import shutil
+import tempfile
+import unittest
+from pyquerystring import logscan
+from pyquerystring import scan_log
+from pyquerystring import count_log
+from pyquerystring import Limits
+from pyquerystring import QueryStringLimitError
+
+
+LOG = b"""\
+10.0.0.1 - - [10/Oct/2026:13:55:36 +0000] "GET /s?q=dogs&utm.source=mail HTTP/1.1" 200 23 "-" "curl"
+10.0.0.2 - - [10/Oct/2026:13:55:37 +0000] "GET /index.html HTTP/1.1" 200 10 "http://x/?utm.source=x" "curl"
+10.0.0.3 - - [10/Oct/2026:13:55:38 +0000] "POST /cart?ids[]=1&ids[]=2&utm[source]=ads#top HTTP/1.1" 200 1 "-" "-"
+10.0.0.4 - - [10/Oct/2026:13:55:39 +0000] "GET /s?q=caf%C3%A9+au+lait&utm.source=mail HTTP/1.1" 200 5 "-" "-"
+"""
+
+
+class ScanLogSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = self.write("access.log", LOG)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_request_line(self):
+        self.assertEqual(list(scan_log(self.path)), [
+            {"q": "dogs", "utm": {"source": "mail"}},
+            {"ids": ["1", "2"], "utm": {"source": "ads"}},
+            {"q": u"caf\xe9 au lait", "utm": {"source": "mail"}},
+        ])
+
+    def test_field(self):
+        self.assertEqual(list(scan_log(self.path, field=6)),
+                         list(scan_log(self.path)))
+
+        results = list(scan_log(self.path, field=10))
+        self.assertEqual(results, [{"utm": {"source": "x"}}])
+
+    def test_pattern(self):
+        pattern = re.compile(br'"http://[^"?]*\?([^"]*)"')
+        results = list(scan_log(self.path, pattern=pattern))
+        self.assertEqual(results, [{"utm": {"source": "x"}}])
+
+        self.assertRaises(TypeError, list,
+                          scan_log(self.path, pattern=pattern, field=6))
+
+    def test_parser_options(self):
+        results = list(scan_log(self.path, include="q"))
+        self.assertEqual(
+            results, [{"q": "dogs"}, {}, {"q": u"caf\xe9 au lait"}])
+
+        with self.assertRaises(QueryStringLimitError):
+            list(scan_log(self.path, limits=Limits(max_pairs=1)))
+
+    def test_map_closed_after_errors(self):
+        maps = []
+
+        class RecordingMap(mmap.mmap):
+            def __init__(self, *args, **kwargs):
+                maps.append(self)
+
+        original = logscan.mmap.mmap
+        logscan.mmap.mmap = RecordingMap
+        try:
+            with self.assertRaises(QueryStringLimitError):
+                list(scan_log(self.path, limits=Limits(max_pairs=1)))
+            with self.assertRaises(QueryStringLimitError):
+                count_log(self.path, "q", limits=Limits(max_pairs=1))
+        finally:
+            logscan.mmap.mmap = original
+
+        self.assertEqual(len(maps), 2)
+        self.assertTrue(all(m.closed for m in maps))
+
+    def test_count(self):
+        counts = count_log(self.path, "utm.source")
+        self.assertEqual(counts, {"mail": 2, "ads": 1})
+
+        self.assertEqual(count_log(self.path, "ids[]"), {"1": 1, "2": 1})
+        self.assertEqual(count_log(self.path, "missing"), {})
+
+        path = self.write("empty_keys.log",
+                          b'"GET /?=x&a.=2&a=3 HTTP/1.1"\n')
+        self.assertEqual(count_log(path, ""), {})
+        self.assertEqual(count_log(path, "a"), {"3": 1})
+
+    def test_stops_early(self):
+        results = scan_log(self.path)
+        self.assertEqual(next(results)["q"], "dogs")
+        results.close()
+
+    def test_empty_file(self):
+        path = self.write("empty.log", b"")
+        self.assertEqual(list(scan_log(path)), [])
+        self.assertEqual(count_log(path, "q"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import sys
+import unittest
+from pyquerystring import parse
+from pyquerystring import ResultCache
+from pyquerystring import CompactObject
+
+
+QS = "page=2&sort=asc&filter[status]=open&ids[]=1&ids[]=2"
+
+
+class ResultCacheSuite(unittest.TestCase):
+
+    def test_hit_returns_shared_immutable_result(self):
+        cache = ResultCache()
+        first = parse(QS, result_cache=cache)
+        second = parse(QS, result_cache=cache)
+
+        self.assertIs(first, second)
+        self.assertIsInstance(first, CompactObject)
+        self.assertEqual(first, parse(QS))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_mutable_results_are_copies(self):
+        cache = ResultCache(immutable=False)
+        first = cache.parse(QS)
+        first["ids"].append("3")
+        second = cache.parse(QS)
+
+        self.assertIs(type(second), dict)
+        self.assertEqual(second, parse(QS))
+
+    def test_maxsize(self):
+        cache = ResultCache(maxsize=2)
+        for qs in ("a=1", "b=2", "a=1", "c=3"):
+            cache.parse(qs)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        cache.parse("a=1")
+        self.assertEqual(cache.hits, 2)
+
+    def test_bytes_estimate_result_size(self):
+        cache = ResultCache()
+        cache.parse("a=1")
+        small = cache.bytes
+        self.assertGreater(small, sys.getsizeof("a=1") + sys.getsizeof("1"))
+
+        cache.clear()
+        cache.parse("rows[0].a=1&rows[1].a=2&rows[2].a=3")
+        self.assertGreater(cache.bytes, 3 * small)
+
+    def test_max_bytes(self):
+        cache = ResultCache()
+        cache.parse("a=1&b=2")
+        one = cache.bytes
+
+        cache = ResultCache(max_bytes=one + one // 2)
+        cache.parse("a=1&b=2")
+        cache.parse("c=3&d=4")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.bytes, one)
+        self.assertEqual(cache.evictions, 1)
+
+        cache.parse("d=" + "x" * one)
+        self.assertEqual(cache.stats()["size"], 1)
+        self.assertEqual(cache.bytes, one)
+
+    def test_bypass(self):
+        cache = ResultCache(max_input_length=5)
+        self.assertEqual(cache.parse("abcdef=1"), {"abcdef": "1"})
+        cache.parse("a=1", bypass=True)
+        cache.parse([("a", "1")])
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bypassed, 3)
+
+    def test_options(self):
+        cache = ResultCache(include="page")
+        self.assertEqual(cache.parse(QS), {"page": "2"})
+        self.assertEqual(cache.parse(QS.encode('ascii')), {"page": "2"})
+
+        with self.assertRaises(TypeError):
+            parse(QS, result_cache=cache, include="sort")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+from pyquerystring import QueryStringParser
+
+
+class MergeSuite(unittest.TestCase):
+
+    def test_merge_in_place(self):
+        obj = QueryStringParser("id=1&dog[0].name=lucy&tags[]=a")
+        result = obj.result
+        dog = result["dog"]
+
+        merged = obj.merge(b"dog[1].name=radar&tags[]=b&cat=ollie")
+        self.assertIs(merged, result)
+        self.assertIs(result["dog"], dog)
+        self.assertEqual(result, {
+            "id": "1",
+            "dog": [{"name": "lucy"}, {"name": "radar"}],
+            "tags": ["a", "b"],
+            "cat": "ollie",
+        })
+
+    def test_new_precedence(self):
+        obj = QueryStringParser("page=2&dog[0].name=lucy&dog[0].age=3")
+        obj.merge("page=3&dog[0].name=radar")
+        self.assertEqual(obj.result, {
+            "page": "3", "dog": [{"name": "radar", "age": "3"}]})
+
+    def test_existing_precedence(self):
+        obj = QueryStringParser("page=2&tags[]=a&filter.status=open")
+        obj.merge("page=1&sort=asc&tags[]=x&filter.status=all"
+                  "&filter.owner=me&ids[]=1&ids[]=2", precedence='existing')
+        self.assertEqual(obj.result, {
+            "page": "2",
+            "sort": "asc",
+            "tags": ["a"],
+            "filter": {"status": "open", "owner": "me"},
+            "ids": ["1", "2"],
+        })
+
+    def test_pushes_follow_indices(self):
+        obj = QueryStringParser("a[0]=x")
+        obj.merge("a[]=z&a[2]=y")
+        self.assertEqual(obj.result["a"], ["x", None, "y", "z"])
+
+    def test_fills_holes(self):
+        obj = QueryStringParser("a[2]=x")
+        obj.merge("a[0]=y", precedence='existing')
+        self.assertEqual(obj.result["a"], ["y", None, "x"])
+
+    def test_containers_win(self):
+        obj = QueryStringParser("a=1&b[0]=2")
+        obj.merge("a.x=3&b=4")
+        self.assertEqual(obj.result, {"a": {"x": "3"}, "b": ["2"]})
+
+        obj.merge("a[0]=5", precedence='existing')
+        self.assertEqual(obj.result["a"], {"x": "3"})
+        obj.merge("a[0]=5")
+        self.assertEqual(obj.result["a"], ["5"])
+
+    def test_matches_single_parse(self):
+        first = "dog[1]=tucker&pets[0].name=kiki&fish.name=robofish"
+        second = "dog[0]=lucy&pets[1].name=pogo&fish.type=fishz"
+        obj = QueryStringParser(first)
+        obj.merge(second)
+        self.assertEqual(obj.result, parse(first + "&" + second))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            QueryStringParser("a=1").merge("b=2", precedence='nope')
+        with self.assertRaises(TypeError):
+            QueryStringParser("a=1", compact=True).merge("b=2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -260,6 +260,39 @@ class QueryStringSuite(unittest.TestCase):
         self.assertEqual(result["dog"][10], "fido")
         self.assertEqual(result["dog"][11], "lucyagain")
 
+    def test_unsorted_indices(self):
+        qs = "&dog[10]=fido&dog[2]=dexter&dog[]=radar&dog[0]=lucy"
+        result = parse(qs)
+
+        self.assertEqual(len(result["dog"]), 12)
+        self.assertEqual(result["dog"][0], "lucy")
+        self.assertEqual(result["dog"][2], "dexter")
+        self.assertEqual(result["dog"][10], "fido")
+        self.assertEqual(result["dog"][11], "radar")
+
+    def test_push_array_of_objects(self):
+        qs = "&dog[].name=lucy&dog[].name=radar"
+        result = parse(qs)
+
+        self.assertEqual(len(result["dog"]), 2)
+        self.assertEqual(result["dog"][0]["name"], "lucy")
+        self.assertEqual(result["dog"][1]["name"], "radar")
+
+    def test_container_wins_over_scalar(self):
+        for qs in ("&dog=lucy&dog[0]=radar", "&dog[0]=radar&dog=lucy"):
+            result = parse(qs)
+            self.assertEqual(result["dog"], ["radar"])
+
+    def test_flat_and_nested_mixed(self):
+        qs = "&a=1&b[0]=2&a=3& c =4&b=5&d.e=6&d=7&=8"
+        result = parse(qs)
+
+        self.assertEqual(result["a"], "3")
+        self.assertEqual(result["b"], ["2"])
+        self.assertEqual(result["c"], "4")
+        self.assertEqual(result["d"], {"e": "6"})
+        self.assertNotIn("", result)
+
 def suite():
     suite = unittest.TestSuite()
     suite.addTest(unittest.makeSuite(QueryStringSuite))
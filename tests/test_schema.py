@@ -0,0 +1,67 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import Schema
+from pyquerystring import Field
+from pyquerystring import QueryStringSchemaError
+
+
+SCHEMA = Schema({
+    'page': Field(int, default=1),
+    'sort': str,
+    'debug': bool,
+    'filter': {'status': str, 'tags': [str]},
+    'items': [{'sku': str, 'qty': Field(int, default=0)}],
+})
+
+
+class SchemaSuite(unittest.TestCase):
+
+    def test_coercion(self):
+        result = SCHEMA.parse("page=20&debug=true&sort=asc")
+        self.assertEqual(result, {"page": 20, "debug": True, "sort": "asc"})
+
+    def test_defaults(self):
+        result = SCHEMA.parse("sort=asc")
+        self.assertEqual(result, {"page": 1, "sort": "asc"})
+
+    def test_nested(self):
+        qs = ("filter[status]=open&filter.tags[]=a&filter.tags[]=b"
+              "&items[1].sku=x2&items[0].sku=x1&items[0].qty=3")
+        result = SCHEMA.parse(qs)
+
+        self.assertEqual(result["filter"], {"status": "open", "tags": ["a", "b"]})
+        self.assertEqual(result["items"][0], {"sku": "x1", "qty": 3})
+        self.assertEqual(result["items"][1], {"sku": "x2", "qty": 0})
+
+    def test_undeclared_keys_dropped(self):
+        qs = ("utm.source=x&filter[owner]=me&items[0].color=red"
+              "&sort[0]=asc&page.size=10&debug=0")
+        result = SCHEMA.parse(qs)
+        self.assertEqual(result, {"page": 1, "debug": False})
+
+    def test_invalid_value(self):
+        with self.assertRaises(QueryStringSchemaError) as ctx:
+            SCHEMA.parse("page=abc")
+        self.assertEqual(ctx.exception.key, "page")
+
+        with self.assertRaises(QueryStringSchemaError):
+            SCHEMA.parse("debug=maybe")
+
+    def test_bytes(self):
+        self.assertEqual(SCHEMA.parse(b"page=3")["page"], 3)
+
+    def test_stream(self):
+        obj = SCHEMA.parser()
+        obj.feed(b"page=")
+        obj.feed(b"4&junk=1")
+        self.assertEqual(obj.close(), {"page": 4})
+
+    def test_must_be_object(self):
+        with self.assertRaises(TypeError):
+            Schema([str])
+
+
+if __name__ == "__main__":
+    unittest.main()
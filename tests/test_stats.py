@@ -0,0 +1,67 @@
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import unittest
+from pyquerystring import parse
+from pyquerystring import KeyPathCache
+from pyquerystring import ParseStats
+from pyquerystring import QueryStringParser
+
+
+QS = "a=1&b[5]=2&b[]=3&c.d.e=4&a=5"
+
+
+class ParseStatsSuite(unittest.TestCase):
+
+    def test_counters(self):
+        stats = ParseStats()
+        result = parse(QS, stats=stats, key_cache=KeyPathCache())
+
+        self.assertEqual(result, parse(QS))
+        self.assertEqual(stats.parses, 1)
+        self.assertEqual(stats.pairs, 5)
+        self.assertEqual(stats.flat_pairs, 2)
+        self.assertEqual(stats.max_depth, 2)
+        self.assertEqual(stats.arrays, 1)
+        self.assertEqual(stats.array_padding, 5)
+        # single name keys are never tokenized, as without stats
+        self.assertEqual(stats.key_cache_hits, 0)
+        self.assertEqual(stats.key_cache_misses, 3)
+
+    def test_flat_keys_match_plain_parse(self):
+        qs = "a[0]=1&a=2&b=3&b=4& c =5"
+        stats = ParseStats()
+        self.assertEqual(parse(qs, stats=stats), parse(qs))
+        self.assertEqual(stats.flat_pairs, 4)
+
+    def test_timings(self):
+        ticks = iter(range(1000))
+        stats = ParseStats(timer=lambda: next(ticks))
+        parse(QS, stats=stats)
+
+        data = stats.as_dict()
+        for phase in ('decode', 'tokenize', 'insert', 'build'):
+            self.assertGreater(data[phase + '_time'], 0)
+
+    def test_accumulates_and_resets(self):
+        stats = ParseStats()
+        parse(QS, stats=stats)
+        parse(QS, stats=stats)
+        self.assertEqual(stats.parses, 2)
+        self.assertEqual(stats.pairs, 10)
+
+        stats.reset()
+        self.assertEqual(stats.as_dict(), dict.fromkeys(ParseStats.FIELDS, 0))
+
+    def test_callback(self):
+        seen = []
+        stats = ParseStats(callback=lambda s: seen.append(s.pairs))
+        obj = QueryStringParser(stats=stats)
+        obj.feed(b"a=1&b=")
+        obj.feed(b"2")
+        obj.close()
+        self.assertEqual(seen, [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
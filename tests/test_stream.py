@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import sys, os
+sys.path.insert(0, os.path.abspath('..'))
+
+import io
+import unittest
+from pyquerystring import parse
+from pyquerystring import parse_stream
+from pyquerystring import QueryStringParser
+
+
+BODY = (
+    "id=foo&dog[1].name=radar&dog[0].name=lucy&cat=ollie"
+    "&name=a+b%20c&emoji=%E2%9C%93&pets[]=kiki&pets[]=pogo"
+)
+
+
+class StreamSuite(unittest.TestCase):
+
+    def test_every_split_point(self):
+        expected = parse(BODY)
+        data = BODY.encode('utf-8')
+        for i in range(len(data) + 1):
+            obj = QueryStringParser()
+            obj.feed(data[:i])
+            obj.feed(data[i:])
+            self.assertEqual(obj.close(), expected)
+
+    def test_single_byte_chunks(self):
+        data = BODY.encode('utf-8')
+        chunks = (data[i:i + 1] for i in range(len(data)))
+        self.assertEqual(parse_stream(chunks), parse(BODY))
+
+    def test_file_like(self):
+        source = io.BytesIO(BODY.encode('utf-8'))
+        result = parse_stream(source, chunk_size=7)
+        self.assertEqual(result["emoji"], u"✓")
+        self.assertEqual(result["name"], "a b c")
+        self.assertEqual(result["dog"][0]["name"], "lucy")
+
+    def test_charset(self):
+        source = io.BytesIO(b"name=caf%E9")
+        result = parse_stream(source, charset='latin-1')
+        self.assertEqual(result["name"], u"café")
+
+    def test_empty(self):
+        self.assertEqual(parse_stream(io.BytesIO(b"")), {})
+
+
+if __name__ == "__main__":
+    unittest.main()